@@ -0,0 +1,129 @@
+"""Batch geometry engine against the SQL location search.
+
+    python -m benchmarks.geo_batch --sizes 10000 100000 1000000 --queries 100
+
+SQL path runs `MonolitDatabaseService.get_transports_by_location` once per query
+point on SQLite, the NumPy path answers all query points in one call.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import insert
+
+from simbirgo.common.geo.batch import FleetPositions
+from simbirgo.monolit.database.models import Base, Transport, TransportTypeEnum, User
+from simbirgo.monolit.database.service import MonolitDatabaseService
+
+CITY_CENTER = (54.3142, 48.4031)
+CITY_SPAN = 0.3  # degrees
+RADIUS_DEGREES = 0.01
+RADIUS_METRES = 1_000
+
+
+async def fill_database(database: MonolitDatabaseService, latitudes, longitudes):
+    owner_id = uuid.uuid4()
+    now = datetime.now()
+    async with database.transaction() as session:
+        await session.execute(
+            insert(User),
+            [{"id": owner_id, "username": "owner", "password": "", "created_at": now}],
+        )
+        for start in range(0, len(latitudes), 10_000):
+            await session.execute(
+                insert(Transport),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "canBeRented": True,
+                        "transportType": TransportTypeEnum.SCOOTER,
+                        "model": "",
+                        "color": "",
+                        "identifier": "",
+                        "latitude": float(latitude),
+                        "longitude": float(longitude),
+                        "userId": owner_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for latitude, longitude in zip(
+                        latitudes[start:start + 10_000], longitudes[start:start + 10_000]
+                    )
+                ],
+            )
+
+
+async def bench_sql(size: int, latitudes, longitudes, queries) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        database = MonolitDatabaseService(dsn=f"sqlite+aiosqlite:///{directory}/bench.db")
+        async with database._engine.begin() as connection:  # pylint: disable=protected-access
+            await connection.run_sync(Base.metadata.create_all)
+        await fill_database(database, latitudes, longitudes)
+
+        started = time.perf_counter()
+        async with database.transaction() as session:
+            for latitude, longitude in queries:
+                await database.get_transports_by_location(
+                    session=session,
+                    latitude=latitude,
+                    longitude=longitude,
+                    radius=RADIUS_DEGREES,
+                    count=None,
+                )
+        elapsed = time.perf_counter() - started
+        await database._engine.dispose()  # pylint: disable=protected-access
+
+    return elapsed
+
+
+def bench_numpy(latitudes, longitudes, queries) -> tuple[float, float]:
+    positions = FleetPositions(latitudes, longitudes)
+    query_latitudes, query_longitudes = queries[:, 0], queries[:, 1]
+
+    started = time.perf_counter()
+    positions.count_within_radius(query_latitudes, query_longitudes, RADIUS_METRES)
+    radius_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    positions.top_k(query_latitudes, query_longitudes, 10)
+    top_k_elapsed = time.perf_counter() - started
+
+    return radius_elapsed, top_k_elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    queries = np.column_stack(
+        [
+            CITY_CENTER[0] + (rng.random(args.queries) - 0.5) * CITY_SPAN,
+            CITY_CENTER[1] + (rng.random(args.queries) - 0.5) * CITY_SPAN,
+        ]
+    )
+
+    print(f"{'vehicles':>10} {'sql radius':>12} {'numpy radius':>13} {'numpy top-10':>13}")
+    for size in args.sizes:
+        latitudes = CITY_CENTER[0] + (rng.random(size) - 0.5) * CITY_SPAN
+        longitudes = CITY_CENTER[1] + (rng.random(size) - 0.5) * CITY_SPAN
+
+        sql_elapsed = asyncio.run(bench_sql(size, latitudes, longitudes, queries))
+        radius_elapsed, top_k_elapsed = bench_numpy(latitudes, longitudes, queries)
+
+        per_query = 1000 / args.queries
+        print(
+            f"{size:>10} {sql_elapsed * per_query:>10.3f}ms {radius_elapsed * per_query:>11.3f}ms "
+            f"{top_k_elapsed * per_query:>11.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Sign and verify throughput of the JWT algorithms supported by the key ring.
+
+    python -m benchmarks.jwt_algorithms --seconds 2
+"""
+import argparse
+import time
+import uuid
+
+from simbirgo.common.jwt.keyring import JWTAlgorithmEnum, JWTKey, KeyRing
+
+
+def measure(function, seconds: float) -> float:
+    operations = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            function()
+        operations += 100
+    return operations / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    payload = {"user_id": str(uuid.uuid4()), "exp": int(time.time()) + 300}
+
+    print(f"{'algorithm':>10} {'sign/s':>10} {'verify/s':>10}")
+    for algorithm in JWTAlgorithmEnum:
+        key = JWTKey.generate(algorithm)
+        key_ring = KeyRing([key], signing_kid=key.kid)
+        token = key_ring.encode(payload)
+
+        sign_rate = measure(lambda: key_ring.encode(payload), args.seconds)
+        verify_rate = measure(lambda: key_ring.decode(token), args.seconds)
+        print(f"{algorithm.value:>10} {sign_rate:>10.0f} {verify_rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Wall time of a CLI invocation and of building the API application in a fresh process.
+
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+APP_BOOT = """
+from simbirgo.common.jwt import get_jwt_methods
+from simbirgo.monolit import api, database
+from simbirgo.monolit.settings import get_settings
+
+settings = get_settings()
+database_service = database.get_service(settings=settings)
+api_service = api.get_service(
+    database=database_service,
+    jwt_methods=get_jwt_methods(settings=settings),
+    settings=settings,
+)
+api_service.get_app()
+"""
+
+COMMANDS = {
+    "monolit --help": [sys.executable, "-m", "simbirgo", "monolit", "--help"],
+    "app boot": [sys.executable, "-c", APP_BOOT],
+}
+
+
+def measure(command: list[str], runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'command':>16} {'min, s':>8} {'median, s':>10}")
+    for name, command in COMMANDS.items():
+        timings = measure(command, args.runs)
+        print(f"{name:>16} {min(timings):>8.3f} {statistics.median(timings):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Per-call overhead of the dynamic filter lookups, rebuilt vs cached statements.
+
+    python -m benchmarks.statement_cache --calls 5000
+
+Both paths run the same queries on an in-memory SQLite with a handful of rows, so
+the time is dominated by statement construction, compilation lookup and ORM loading.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+from simbirgo.monolit.database.models import (
+    Base,
+    Rent,
+    RentPriceEnum,
+    Transport,
+    TransportTypeEnum,
+    User,
+)
+from simbirgo.monolit.database.service import MonolitDatabaseService
+
+
+async def rebuilt_get_transport(session, transportId):
+    stmt = select(Transport).where(*[Transport.id == transportId])
+    result = await session.execute(stmt)
+    return result.unique().scalar_one_or_none()
+
+
+async def rebuilt_get_rent(session, rentId, userId):
+    stmt = select(Rent).where(*[Rent.userId == userId, Rent.id == rentId])
+    result = await session.execute(stmt)
+    return result.unique().scalar_one_or_none()
+
+
+async def rebuilt_get_rents(session, userId, count):
+    stmt = select(Rent).order_by(Rent.created_at, Rent.id).limit(count).offset(0)
+    stmt = stmt.where(*[Rent.userId == userId])
+    result = await session.execute(stmt)
+    return result.scalars().all()
+
+
+async def fill_database(database: MonolitDatabaseService) -> tuple[uuid.UUID, ...]:
+    user_id, transport_id, rent_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    now = datetime.now()
+    async with database.transaction() as session:
+        await session.execute(
+            insert(User),
+            [{"id": user_id, "username": "user", "password": "", "created_at": now}],
+        )
+        await session.execute(
+            insert(Transport),
+            [
+                {
+                    "id": transport_id,
+                    "transportType": TransportTypeEnum.CAR,
+                    "model": "",
+                    "color": "",
+                    "identifier": "",
+                    "userId": user_id,
+                    "created_at": now,
+                }
+            ],
+        )
+        await session.execute(
+            insert(Rent),
+            [
+                {
+                    "id": rent_id,
+                    "transportId": transport_id,
+                    "userId": user_id,
+                    "timeStart": now,
+                    "priceOfUnit": 1.0,
+                    "priceType": RentPriceEnum.MINUTES,
+                    "created_at": now,
+                }
+            ],
+        )
+    return user_id, transport_id, rent_id
+
+
+async def measure(database: MonolitDatabaseService, calls: int, lookup) -> float:
+    async with database.transaction() as session:
+        await lookup(session)
+        started = time.perf_counter()
+        for _ in range(calls):
+            await lookup(session)
+            session.expunge_all()
+        return (time.perf_counter() - started) / calls
+
+
+async def run(calls: int):
+    database = MonolitDatabaseService(dsn="sqlite+aiosqlite://")
+    async with database._engine.begin() as connection:  # pylint: disable=protected-access
+        await connection.run_sync(Base.metadata.create_all)
+    user_id, transport_id, rent_id = await fill_database(database)
+
+    cases = {
+        "get_transport": (
+            lambda session: rebuilt_get_transport(session, transport_id),
+            lambda session: database.get_transport(session=session, transportId=transport_id),
+        ),
+        "get_rent": (
+            lambda session: rebuilt_get_rent(session, rent_id, user_id),
+            lambda session: database.get_rent(session=session, rentId=rent_id, userId=user_id),
+        ),
+        "get_rents": (
+            lambda session: rebuilt_get_rents(session, user_id, 20),
+            lambda session: database.get_rents(session=session, userId=user_id, count=20),
+        ),
+    }
+
+    print(f"{'lookup':>14} {'rebuilt':>10} {'cached':>10} {'speedup':>8}")
+    for name, (rebuilt, cached) in cases.items():
+        rebuilt_elapsed = await measure(database, calls, rebuilt)
+        cached_elapsed = await measure(database, calls, cached)
+        print(
+            f"{name:>14} {rebuilt_elapsed * 1e6:>8.1f}us {cached_elapsed * 1e6:>8.1f}us "
+            f"{rebuilt_elapsed / cached_elapsed:>7.2f}x"
+        )
+
+    await database._engine.dispose()  # pylint: disable=protected-access
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=5_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
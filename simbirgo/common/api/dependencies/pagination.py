@@ -1,14 +1,59 @@
+import base64
+import uuid
+from datetime import datetime
+
 from fastapi import Query
-from pydantic import BaseModel, conint
+from pydantic import BaseModel, ValidationError, conint
+
+from simbirgo.common.api.exceptions import HTTPBadRequest
+from simbirgo.common.database.counting import CountModeEnum
+
+
+class Cursor(BaseModel):
+    """Position right after the (created_at, id) of the last item of a page."""
+
+    created_at: datetime
+    id: uuid.UUID
+
+    @classmethod
+    def from_db_model(cls, model) -> "Cursor":
+        return cls(created_at=model.created_at, id=model.id)
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        padding = "=" * (-len(token) % 4)
+        return cls.model_validate_json(base64.urlsafe_b64decode(token + padding))
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode().rstrip("=")
+
+    def as_tuple(self) -> tuple[datetime, uuid.UUID]:
+        return self.created_at, self.id
 
 
 class Pagination(BaseModel):
     start: int
     count: int
+    cursor: Cursor | None = None
+    total: CountModeEnum | None = None
+
+    @property
+    def after(self) -> tuple[datetime, uuid.UUID] | None:
+        return None if self.cursor is None else self.cursor.as_tuple()
 
 
 async def pagination(
     start: conint(ge=0) = Query(0, description="Start position"),
     count: conint(ge=1) = Query(10, description="Number of items to show"),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page"),
+    total: CountModeEnum | None = Query(
+        None, description="Fill `total_items`, `estimated` may be approximate for big sets"
+    ),
 ) -> Pagination:
-    return Pagination(start=start, count=count)
+    if cursor is None:
+        return Pagination(start=start, count=count, total=total)
+
+    try:
+        return Pagination(start=start, count=count, cursor=Cursor.decode(cursor), total=total)
+    except (ValueError, ValidationError):
+        raise HTTPBadRequest("Invalid cursor.")
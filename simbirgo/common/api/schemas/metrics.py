@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+from simbirgo.common.database.instrumentation import QueryStatistics
+from simbirgo.common.database.pool import PoolStatistics
+from simbirgo.common.utils.cache import CacheStatistics
+
+
+class DatabaseMetrics(BaseModel):
+    pool: PoolStatistics | None
+    queries: QueryStatistics
+
+
+class MetricsResponse(BaseModel):
+    database: DatabaseMetrics
+    caches: dict[str, CacheStatistics] = {}
@@ -1,11 +1,42 @@
-from typing import Any
+import math
+from typing import Any, Callable, Generic, Sequence, TypeVar
 
 from pydantic import BaseModel
 
+from simbirgo.common.api.dependencies.pagination import Cursor, Pagination
 
-class PaginatedResponse(BaseModel):
-    data: list[Any]
-    page: int
+ItemT = TypeVar("ItemT")
+
+
+class PaginatedResponse(BaseModel, Generic[ItemT]):
+    data: list[ItemT]
+    page: int | None = None
     per_page: int
+    next_cursor: str | None = None
     total_pages: int | None = None
     total_items: int | None = None
+
+    @classmethod
+    def from_db_models(
+        cls,
+        db_models: Sequence[Any],
+        pagination: Pagination,
+        serialize: Callable[[Any], ItemT],
+        total_items: int | None = None,
+    ) -> "PaginatedResponse[ItemT]":
+        """Build a page from up to `pagination.count + 1` models ordered by (created_at, id),
+        the extra model only tells that there is a next page.
+        """
+        items = db_models[: pagination.count]
+        next_cursor = None
+        if len(db_models) > pagination.count:
+            next_cursor = Cursor.from_db_model(items[-1]).encode()
+
+        return cls(
+            data=[serialize(i) for i in items],
+            page=None if pagination.cursor else pagination.start // pagination.count + 1,
+            per_page=pagination.count,
+            next_cursor=next_cursor,
+            total_items=total_items,
+            total_pages=None if total_items is None else math.ceil(total_items / pagination.count),
+        )
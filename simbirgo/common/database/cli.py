@@ -79,17 +79,22 @@ def fixtures_list(ctx: typer.Context):
 @logger.catch
 def fixtures_apply(
     ctx: typer.Context,
-    name: str = typer.Argument(..., help="Fixture name"),
+    names: list[str] = typer.Argument(..., help="Fixture names, applied in models order"),
     fixture_format: FixtureFormatEnum = typer.Option(
         FixtureFormatEnum.YAML,
         "-f",
         "--format",
         help="Fixture format/extension",
     ),
+    batch_size: int = typer.Option(5_000, "-b", "--batch-size", help="Rows per insert batch"),
 ):
     database_service = ctx.obj["database"]
 
-    asyncio.run(database_service.apply_fixture(name=name, fixture_format=fixture_format))
+    asyncio.run(
+        database_service.apply_fixtures(
+            names=names, fixture_format=fixture_format, batch_size=batch_size
+        )
+    )
 
 
 def get_fixtures_cli() -> typer.Typer:
@@ -0,0 +1,83 @@
+import enum
+import json
+from typing import Any, Hashable
+
+from sqlalchemy import Select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from simbirgo.common.utils.cache import TTLCache
+
+
+class CountModeEnum(str, enum.Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
+class RowCounter:
+    """Totals of list queries, cached per filters for `cache_ttl` seconds.
+
+    Estimated counts come from the Postgres planner, small estimates (up to
+    `exact_threshold` rows) are cheap to count for real and are made exact. Other
+    databases always get an exact count.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 1024,
+        cache_ttl: float = 10,
+        exact_threshold: int = 1000,
+    ):
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._exact_threshold = exact_threshold
+
+    async def count(
+        self,
+        session: AsyncSession,
+        stmt: Select,
+        mode: CountModeEnum,
+        key: Hashable,
+        params: dict[str, Any] | None = None,
+    ) -> int:
+        """Count rows of `stmt`, a select without ordering and paging, `key` identifies
+        its filters in the cache.
+        """
+        cache_key = (key, mode)
+        total = self._cache.get(cache_key)
+        if total is not None:
+            return total
+
+        total = None
+        if mode == CountModeEnum.ESTIMATED and session.bind.dialect.name == "postgresql":
+            total = await self._estimate(session, stmt, params)
+            if total <= self._exact_threshold:
+                total = None
+        if total is None:
+            count_stmt = stmt.with_only_columns(func.count(), maintain_column_froms=True)
+            total = (await session.execute(count_stmt, params)).scalar_one()
+
+        self._cache.set(cache_key, total)
+        return total
+
+    @staticmethod
+    async def _estimate(
+        session: AsyncSession, stmt: Select, params: dict[str, Any] | None
+    ) -> int:
+        connection = await session.connection()
+        plan = (await connection.execute(Explain(stmt), params)).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,16 @@
+import fastapi
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from simbirgo.common.database.middleware import UNIT_OF_WORK_SCOPE_KEY
+from simbirgo.common.database.service import UnitOfWork
+
+
+async def get_request_session(request: fastapi.Request) -> AsyncSession:
+    unit_of_work: UnitOfWork = request.scope[UNIT_OF_WORK_SCOPE_KEY]
+    return await unit_of_work.get_session()
+
+
+async def read_only_request(request: fastapi.Request):
+    """Route dependency, sends all queries of the request to a read replica."""
+    unit_of_work: UnitOfWork = request.scope[UNIT_OF_WORK_SCOPE_KEY]
+    unit_of_work.read_only = True
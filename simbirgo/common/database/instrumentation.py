@@ -0,0 +1,132 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy import Connection, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from simbirgo.common.database.pool import LatencyHistogram
+
+QUERY_STARTED_KEY = "query_started"
+EXPLAIN_SAVEPOINT = "explain_slow_query"
+
+
+class QueryStats:
+    """Queries executed within one scope (a request), see `track_queries`."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+class QueryStatistics(BaseModel):
+    count: int
+    slow_count: int
+    latency_sum: float
+    latency_buckets: dict[str, int]
+
+
+class QueryInstrumentation:
+    """Times every statement executed by the attached engines.
+
+    Statements slower than `slow_query_threshold` seconds are logged with their parameters
+    and, with `explain_slow_queries`, with the plan of SELECTs.
+    """
+
+    def __init__(
+        self,
+        slow_query_threshold: float | None = None,
+        explain_slow_queries: bool = False,
+    ):
+        self._slow_query_threshold = slow_query_threshold
+        self._explain_slow_queries = explain_slow_queries
+        self._latency_histogram = LatencyHistogram()
+        self._slow_count = 0
+
+    def attach(self, engine: AsyncEngine):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def get_statistics(self) -> QueryStatistics:
+        return QueryStatistics(
+            count=self._latency_histogram.count,
+            slow_count=self._slow_count,
+            latency_sum=self._latency_histogram.sum,
+            latency_buckets=self._latency_histogram.get_buckets(),
+        )
+
+    def _before_cursor_execute(self, conn: Connection, *_):
+        conn.info[QUERY_STARTED_KEY] = time.perf_counter()
+
+    def _after_cursor_execute(
+        self,
+        conn: Connection,
+        _cursor: Any,
+        statement: str,
+        parameters: Any,
+        _context: Any,
+        executemany: bool,
+    ):
+        started = conn.info.pop(QUERY_STARTED_KEY, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+
+        self._latency_histogram.observe(elapsed)
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+
+        if self._slow_query_threshold is None or elapsed < self._slow_query_threshold:
+            return
+        self._slow_count += 1
+        if executemany:
+            logger.warning("Slow query {:.1f}ms: {} (executemany)", elapsed * 1000, statement)
+            return
+        plan = self._explain(conn, statement, parameters) if self._explain_slow_queries else ""
+        logger.warning("Slow query {:.1f}ms: {} {}{}", elapsed * 1000, statement, parameters, plan)
+
+    @staticmethod
+    def _explain(conn: Connection, statement: str, parameters: Any) -> str:
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return ""
+
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        # The plan is read on the query's connection, within its transaction. A failed
+        # statement aborts a Postgres transaction, so EXPLAIN gets a savepoint there.
+        savepoint = conn.dialect.name != "sqlite"
+        cursor = conn.connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            finally:
+                if savepoint:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                    cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            return f"\nEXPLAIN failed: {error}"
+        finally:
+            cursor.close()
+        return "\n" + "\n".join(" ".join(str(value) for value in row) for row in rows)
@@ -0,0 +1,76 @@
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .instrumentation import track_queries
+from .service import BaseDatabaseService
+
+UNIT_OF_WORK_SCOPE_KEY = "unit_of_work"
+
+
+class UnitOfWorkMiddleware:
+    """Give every HTTP request one unit of work and finish it right before the response.
+
+    The session is committed when a successful response starts, so a failed commit
+    still ends up as a server error, and rolled back for error responses.
+    """
+
+    def __init__(self, app: ASGIApp, database: BaseDatabaseService):
+        self._app = app
+        self._database = database
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        unit_of_work = self._database.unit_of_work()
+        scope[UNIT_OF_WORK_SCOPE_KEY] = unit_of_work
+
+        async def send_after_commit(message: Message):
+            if message["type"] == "http.response.start":
+                if message["status"] < 400:
+                    await unit_of_work.commit()
+                else:
+                    await unit_of_work.rollback()
+            await send(message)
+
+        try:
+            await self._app(scope, receive, send_after_commit)
+        finally:
+            await unit_of_work.rollback()
+
+
+class QueryStatsMiddleware:
+    """Count queries and database time of every HTTP request.
+
+    The totals go to the `Server-Timing` response header and to the debug log, add it
+    outside of `UnitOfWorkMiddleware` so the commit is counted as well.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_stats(message: Message):
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.duration * 1000:.2f};desc="queries: {stats.count}"',
+                    )
+                    logger.debug(
+                        "{} {}: {} queries in {:.2f}ms",
+                        scope["method"],
+                        scope["path"],
+                        stats.count,
+                        stats.duration * 1000,
+                    )
+                await send(message)
+
+            await self._app(scope, receive, send_with_stats)
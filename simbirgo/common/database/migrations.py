@@ -0,0 +1,30 @@
+from typing import Sequence
+
+from alembic import op
+
+
+def is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def create_index_concurrently(index_name: str, table_name: str, columns: Sequence[str], **kwargs):
+    """`op.create_index` that does not block writes to the table on PostgreSQL.
+
+    `CREATE INDEX CONCURRENTLY` can't run inside a transaction, so env.py has to run
+    migrations with `transaction_per_migration=True` for the autocommit block to work.
+    """
+    if not is_postgresql():
+        op.create_index(index_name, table_name, columns, **kwargs)
+        return
+
+    with op.get_context().autocommit_block():
+        op.create_index(index_name, table_name, columns, postgresql_concurrently=True, **kwargs)
+
+
+def drop_index_concurrently(index_name: str, table_name: str, **kwargs):
+    if not is_postgresql():
+        op.drop_index(index_name, table_name=table_name, **kwargs)
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, **kwargs)
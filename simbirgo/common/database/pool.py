@@ -0,0 +1,63 @@
+import bisect
+import time
+
+from pydantic import BaseModel
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+# Upper bounds (seconds) of latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, seconds: float):
+        self._counts[bisect.bisect_left(self._buckets, seconds)] += 1
+        self._count += 1
+        self._sum += seconds
+
+    def get_buckets(self) -> dict[str, int]:
+        """Cumulative counts keyed by bucket upper bound, Prometheus style."""
+        result = {}
+        total = 0
+        for bound, count in zip((*map(str, self._buckets), "+Inf"), self._counts):
+            total += count
+            result[bound] = total
+        return result
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long every checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = LatencyHistogram()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_histogram.observe(time.perf_counter() - started)
+
+
+class PoolStatistics(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    wait_count: int = 0
+    wait_sum: float = 0.0
+    wait_buckets: dict[str, int] = {}
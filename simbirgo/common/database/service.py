@@ -1,9 +1,11 @@
 import enum
 import json
 import pathlib
+import time
 import uuid
-from contextlib import asynccontextmanager
-from typing import Any, Type
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import Any, Callable, Hashable, Iterable, Iterator, Sequence, TextIO, Type
 
 import yaml
 from alembic import command as alembic_command
@@ -11,13 +13,27 @@ from alembic.config import Config as AlembicConfig
 from facet import ServiceMixin
 from loguru import logger
 from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import Enum, Select, Table, insert, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
+from simbirgo.common.database.counting import CountModeEnum, RowCounter
+from simbirgo.common.database.instrumentation import QueryInstrumentation, QueryStatistics
+from simbirgo.common.database.pool import InstrumentedAsyncQueuePool, PoolStatistics
+from simbirgo.common.utils.functools import batched
+
 
 class FixtureFormatEnum(str, enum.Enum):
     YAML = "yaml"
     JSON = "json"
+    JSONL = "jsonl"
 
 
 class FixtureMetadata(BaseModel):
@@ -25,21 +41,176 @@ class FixtureMetadata(BaseModel):
     format: FixtureFormatEnum
 
 
+class FixtureHeader(BaseModel):
+    model: str
+
+
 class FixtureContent(BaseModel):
     model: str
     data: list[dict[str, Any]]
 
 
+class UnitOfWork:
+    """One session shared by everything that runs within a request, begun on first use."""
+
+    def __init__(self, database: "BaseDatabaseService", read_only: bool = False):
+        self._database = database
+        self._read_only = read_only
+        self._session: AsyncSession | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    @read_only.setter
+    def read_only(self, value: bool):
+        if self._session is not None and value != self._read_only:
+            raise RuntimeError("Can't switch read only mode of a started unit of work")
+        self._read_only = value
+
+    async def get_session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = await self._database.begin_session(read_only=self._read_only)
+        return self._session
+
+    async def commit(self):
+        if self._session is None:
+            return
+
+        session, self._session = self._session, None
+        try:
+            await session.commit()
+        finally:
+            await session.close()
+        self._database.run_after_commit_callbacks(session)
+
+    async def rollback(self):
+        if self._session is None:
+            return
+
+        session, self._session = self._session, None
+        session.info.pop(self._database.AFTER_COMMIT_CALLBACKS_KEY, None)
+        try:
+            await session.rollback()
+        finally:
+            await session.close()
+
+
 class BaseDatabaseService(ServiceMixin):
     FIXTURES_FORMATS_MAPPING = {
         FixtureFormatEnum.YAML: yaml.safe_load,
         FixtureFormatEnum.JSON: json.load,
     }
-
-    def __init__(self, dsn: str):
+    BULK_INSERT_PROGRESS_ROWS = 100_000
+    AFTER_COMMIT_CALLBACKS_KEY = "after_commit_callbacks"
+
+    def __init__(
+        self,
+        dsn: str,
+        replica_dsns: Sequence[str] = (),
+        pool_size: int = 5,
+        pool_max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = 1800,
+        pool_warmup: int = 0,
+        statement_cache_size: int = 100,
+        slow_query_threshold: float | None = None,
+        explain_slow_queries: bool = False,
+        count_cache_ttl: float = 10,
+        count_exact_threshold: int = 1000,
+    ):
         self._dsn = dsn
-        self._engine = create_async_engine(self._dsn, pool_recycle=60)
+        self._row_counter = RowCounter(
+            cache_ttl=count_cache_ttl, exact_threshold=count_exact_threshold
+        )
+        self._instrumentation = QueryInstrumentation(
+            slow_query_threshold=slow_query_threshold,
+            explain_slow_queries=explain_slow_queries,
+        )
+        self._pool_warmup = min(pool_warmup, pool_size)
+        pool_options = {
+            "pool_size": pool_size,
+            "pool_max_overflow": pool_max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_pre_ping": pool_pre_ping,
+            "pool_recycle": pool_recycle,
+            "statement_cache_size": statement_cache_size,
+        }
+        self._engine = self._create_engine(self._dsn, **pool_options)
         self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False)
+        self._replica_engines = [
+            self._create_engine(replica_dsn, **pool_options) for replica_dsn in replica_dsns
+        ]
+        self._replica_sessionmakers = [
+            async_sessionmaker(engine, expire_on_commit=False) for engine in self._replica_engines
+        ]
+        self._next_replica = 0
+
+    def _create_engine(self, dsn: str, **pool_options) -> AsyncEngine:
+        engine = create_async_engine(dsn, **self.get_engine_options(dsn=dsn, **pool_options))
+        self._instrumentation.attach(engine)
+        return engine
+
+    def get_engine_options(
+        self,
+        dsn: str,
+        pool_size: int,
+        pool_max_overflow: int,
+        pool_timeout: float,
+        pool_pre_ping: bool,
+        pool_recycle: int,
+        statement_cache_size: int,
+    ) -> dict[str, Any]:
+        url = make_url(dsn)
+        options: dict[str, Any] = {"pool_pre_ping": pool_pre_ping, "pool_recycle": pool_recycle}
+
+        # In-memory sqlite lives in a single connection, keep the dialect's default pool for it
+        if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            return options
+
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=pool_size,
+            max_overflow=pool_max_overflow,
+            pool_timeout=pool_timeout,
+        )
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "prepared_statement_cache_size": statement_cache_size,
+                "statement_cache_size": statement_cache_size,
+            }
+
+        return options
+
+    def get_pool_statistics(self) -> PoolStatistics | None:
+        pool = self._engine.pool
+        if not isinstance(pool, InstrumentedAsyncQueuePool):
+            return None
+
+        return PoolStatistics(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            wait_count=pool.wait_histogram.count,
+            wait_sum=pool.wait_histogram.sum,
+            wait_buckets=pool.wait_histogram.get_buckets(),
+        )
+
+    def get_query_statistics(self) -> QueryStatistics:
+        return self._instrumentation.get_statistics()
+
+    async def warmup_pool(self, connections: int):
+        """Open `connections` pooled connections up front so first requests don't pay for them."""
+        async with AsyncExitStack() as stack:
+            for _ in range(connections):
+                await stack.enter_async_context(self._engine.connect())
+        logger.info("Database pool warmed up with {} connections", connections)
 
     def get_alembic_config_path(self) -> pathlib.Path:
         raise NotImplementedError
@@ -63,20 +234,75 @@ class BaseDatabaseService(ServiceMixin):
             "For working with fixtures you need override `get_models_mapping` method",
         )
 
-    def prepare_fixture_fields_for_model(self, fields: dict[str, Any]) -> dict[str, Any]:
-        for name, value in fields.items():
-            try:
-                fields[name] = uuid.UUID(value)
-            except ValueError:
-                pass
+    def create_session(self) -> AsyncSession:
+        return self._sessionmaker()
 
-        return fields
+    async def _connect_replica_session(self) -> AsyncSession | None:
+        replicas_count = len(self._replica_sessionmakers)
+        for _ in range(replicas_count):
+            index = self._next_replica
+            self._next_replica = (index + 1) % replicas_count
+            session = self._replica_sessionmakers[index]()
+            try:
+                await session.connection()
+            except (DBAPIError, OSError, PoolTimeoutError) as error:
+                logger.warning("Database replica #{} is unavailable: {}", index, error)
+                await session.close()
+                continue
+            return session
+        return None
+
+    async def begin_session(self, read_only: bool = False) -> AsyncSession:
+        """Create a session with a begun transaction.
+
+        Read only sessions go to the replicas round-robin, the primary is used when
+        there are no replicas or none of them accepts a connection.
+        """
+        if read_only:
+            session = await self._connect_replica_session()
+            if session is not None:
+                return session
+
+        session = self.create_session()
+        await session.begin()
+        return session
+
+    async def count_rows(
+        self,
+        session: AsyncSession,
+        stmt: Select,
+        mode: CountModeEnum,
+        key: Hashable,
+        params: dict[str, Any] | None = None,
+    ) -> int:
+        return await self._row_counter.count(session, stmt, mode=mode, key=key, params=params)
+
+    def unit_of_work(self) -> UnitOfWork:
+        return UnitOfWork(database=self)
 
     @asynccontextmanager
-    async def transaction(self):
-        async with self._sessionmaker() as session:
-            async with session.begin():
+    async def transaction(self, read_only: bool = False):
+        session = await self.begin_session(read_only=read_only)
+        async with session:
+            try:
                 yield session
+            except BaseException:
+                await session.rollback()
+                raise
+            await session.commit()
+        self.run_after_commit_callbacks(session)
+
+    def after_commit(self, session: AsyncSession, callback: Callable[[], None]):
+        """Run `callback` once the transaction of `session` is committed."""
+        session.info.setdefault(self.AFTER_COMMIT_CALLBACKS_KEY, []).append(callback)
+
+    def run_after_commit_callbacks(self, session: AsyncSession):
+        callbacks = session.info.pop(self.AFTER_COMMIT_CALLBACKS_KEY, [])
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("After commit callback {} failed", callback)
 
     def migrate(self):
         alembic_command.upgrade(self.get_alembic_config(), "head")
@@ -110,35 +336,162 @@ class BaseDatabaseService(ServiceMixin):
 
         return fixtures_data
 
+    def _open_fixture_file(self, name: str, fixture_format: FixtureFormatEnum) -> TextIO:
+        fixture_file_path = self.get_fixtures_directory_path() / f"{name}.{fixture_format.value}"
+        return open(fixture_file_path, "rt", encoding="utf-8")
+
+    @contextmanager
+    def read_fixture(
+        self,
+        name: str,
+        fixture_format: FixtureFormatEnum = FixtureFormatEnum.YAML,
+    ) -> Iterator[tuple[str, Iterator[dict[str, Any]]]]:
+        """Open a fixture and give its model name and an iterator over its records.
+
+        JSON Lines fixtures are read line by line: the first line is `{"model": ...}`, every
+        next line is one record. YAML and JSON fixtures are loaded as a whole.
+        """
+        with self._open_fixture_file(name, fixture_format) as fixture_file:
+            if fixture_format == FixtureFormatEnum.JSONL:
+                header = FixtureHeader(**json.loads(fixture_file.readline()))
+                records = (json.loads(line) for line in fixture_file if line.strip())
+                yield header.model, records
+            else:
+                fixture_file_loader = self.FIXTURES_FORMATS_MAPPING[fixture_format]
+                fixture_content = FixtureContent(**fixture_file_loader(fixture_file))
+                yield fixture_content.model, iter(fixture_content.data)
+
+    def prepare_fixture_fields_for_model(
+        self, table: Table, fields: dict[str, Any]
+    ) -> dict[str, Any]:
+        for name, value in fields.items():
+            if value is None or name not in table.c:
+                continue
+            column_type = table.c[name].type
+            if isinstance(column_type, Enum) and column_type.enum_class is not None:
+                fields[name] = column_type.enum_class(value)
+                continue
+            try:
+                python_type = column_type.python_type
+            except NotImplementedError:
+                continue
+            if python_type is uuid.UUID and not isinstance(value, uuid.UUID):
+                fields[name] = uuid.UUID(value)
+            elif python_type is datetime and isinstance(value, str):
+                fields[name] = datetime.fromisoformat(value)
+
+        # Bulk inserts skip the ORM, so fill client side defaults (ids, timestamps) here
+        for column in table.c:
+            if column.key not in fields and column.default is not None:
+                default = column.default
+                fields[column.key] = default.arg(None) if default.is_callable else default.arg
+
+        return fields
+
+    async def _insert_batch(
+        self,
+        session: AsyncSession,
+        table: Table,
+        batch: list[dict[str, Any]],
+    ):
+        connection = await session.connection()
+        if connection.dialect.driver != "asyncpg":
+            await connection.execute(insert(table), batch)
+            return
+
+        columns = list(batch[0])
+        records = [
+            tuple(
+                value.name if isinstance(value, enum.Enum) else value
+                for value in (fields[column] for column in columns)
+            )
+            for fields in batch
+        ]
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=columns, schema_name=table.schema,
+        )
+
+    async def bulk_insert(
+        self,
+        table: Table,
+        records: Iterable[dict[str, Any]],
+        batch_size: int = 5_000,
+    ) -> int:
+        """Insert `records` in batches of `batch_size` rows in one transaction.
+
+        Postgres (asyncpg) batches go through `COPY`, other databases get `executemany`.
+        Records are consumed lazily, so they can come from a generator of any size.
+        """
+        started = time.perf_counter()
+        rows_count = 0
+
+        async with self.transaction() as session:
+            for batch in batched(records, batch_size):
+                await self._insert_batch(session, table, batch)
+                rows_count += len(batch)
+                if rows_count % self.BULK_INSERT_PROGRESS_ROWS < len(batch):
+                    logger.info(
+                        "Insert into '{}': {} rows, {:.0f} rows/s",
+                        table.name,
+                        rows_count,
+                        rows_count / (time.perf_counter() - started),
+                    )
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Inserted {} rows into '{}' in {:.2f}s, {:.0f} rows/s",
+            rows_count,
+            table.name,
+            elapsed,
+            rows_count / elapsed if elapsed else 0,
+        )
+        return rows_count
+
     async def apply_fixture(
             self,
             name: str,
             fixture_format: FixtureFormatEnum = FixtureFormatEnum.YAML,
-    ):
-        fixtures_directory_path = self.get_fixtures_directory_path()
+            batch_size: int = 5_000,
+    ) -> int:
         models_mapping = {model.__tablename__: model for model in self.get_models()}
-
-        fixture_file_path = fixtures_directory_path / f"{name}.{format.value}"
-        fixture_file_loader = self.FIXTURES_FORMATS_MAPPING[fixture_format]
-        with open(fixture_file_path, "rt", encoding="utf-8") as fixture_file:
-            fixture_payload = fixture_file_loader(fixture_file)
-        fixture_content = FixtureContent(**fixture_payload)
         logger.info("Load fixture '{}'", name)
 
-        model = models_mapping.get(fixture_content.model)
-        if model is None:
-            raise ValueError(f"Incorrect model name in fixture '{name}': {fixture_content.model}")
-        records = [
-            model(**self.prepare_fixture_fields_for_model(fields))
-            for fields in fixture_content.data
-        ]
+        with self.read_fixture(name, fixture_format) as (model_name, records):
+            model = models_mapping.get(model_name)
+            if model is None:
+                raise ValueError(f"Incorrect model name in fixture '{name}': {model_name}")
+            table = model.__table__
+            records = (self.prepare_fixture_fields_for_model(table, fields) for fields in records)
+
+            rows_count = await self.bulk_insert(table, records, batch_size=batch_size)
 
-        async with self.transaction() as session:
-            session.add_all(records)
         logger.info("Fixture '{}' apply to database", name)
+        return rows_count
+
+    async def apply_fixtures(
+        self,
+        names: Sequence[str],
+        fixture_format: FixtureFormatEnum = FixtureFormatEnum.YAML,
+        batch_size: int = 5_000,
+    ):
+        """Apply several fixtures, parents first, following the order of `get_models`."""
+        models_order = {model.__tablename__: index for index, model in enumerate(self.get_models())}
+        fixtures_order = {}
+        for name in names:
+            with self.read_fixture(name, fixture_format) as (model_name, _):
+                fixtures_order[name] = models_order.get(model_name, len(models_order))
+
+        for name in sorted(names, key=fixtures_order.__getitem__):
+            await self.apply_fixture(name, fixture_format=fixture_format, batch_size=batch_size)
 
     async def start(self):
         logger.info("Start Database service")
+        if self._pool_warmup:
+            await self.warmup_pool(self._pool_warmup)
 
     async def stop(self):
         logger.info("Stop Database service")
+        await self._engine.dispose()
+        for engine in self._replica_engines:
+            await engine.dispose()
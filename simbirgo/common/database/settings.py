@@ -1,6 +1,26 @@
-from pydantic import AnyUrl
+from pydantic import AnyUrl, NonNegativeInt, PositiveFloat, PositiveInt
 from pydantic_settings import BaseSettings
 
 
 class BaseDatabaseSettings(BaseSettings):
     db_dsn: AnyUrl
+    # Read only transactions are spread over the replicas, the primary is used without them
+    db_replica_dsns: list[AnyUrl] = []
+
+    db_pool_size: PositiveInt = 5
+    db_pool_max_overflow: NonNegativeInt = 10
+    db_pool_timeout: PositiveFloat = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    db_pool_warmup: NonNegativeInt = 0
+    # Prepared statements cached per asyncpg connection, 0 disables (needed behind pgbouncer)
+    db_statement_cache_size: NonNegativeInt = 100
+
+    # Statements running longer (seconds) are logged, optionally with their EXPLAIN plan
+    db_slow_query_threshold: PositiveFloat | None = 0.5
+    db_explain_slow_queries: bool = False
+
+    # Totals of list endpoints are cached this long (seconds), planner estimates up to
+    # `db_count_exact_threshold` rows are replaced with exact counts
+    db_count_cache_ttl: PositiveFloat = 10
+    db_count_exact_threshold: NonNegativeInt = 1000
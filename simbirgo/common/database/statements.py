@@ -0,0 +1,54 @@
+from typing import Any, Callable, Hashable, Mapping
+
+from sqlalchemy import Select, bindparam
+from sqlalchemy.sql.elements import ColumnElement
+
+from simbirgo.common.utils.empty import Empty
+
+
+class StatementCache:
+    """Statements built once per query shape and executed with different parameters.
+
+    Reusing the same statement object lets SQLAlchemy skip statement construction and
+    take its cache key, and so the compiled form, from the memoized statement.
+    """
+
+    def __init__(self):
+        self._statements: dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = build()
+        return statement
+
+
+def get_filters(**values: Any) -> dict[str, Any]:
+    """Filters that were passed, `Empty` ones are dropped."""
+    return {name: value for name, value in values.items() if value is not Empty}
+
+
+def get_filters_shape(filters: Mapping[str, Any]) -> tuple[tuple[str, bool], ...]:
+    # `None` is compared with IS NULL, which takes no parameter and so is its own shape
+    return tuple(sorted((name, value is None) for name, value in filters.items()))
+
+
+def where_equal(
+    stmt: Select,
+    columns: Mapping[str, ColumnElement],
+    shape: tuple[tuple[str, bool], ...],
+) -> Select:
+    """Add `column == :name` for every filter of `shape`, bound at execution."""
+    return stmt.where(
+        *(
+            columns[name].is_(None) if is_null else columns[name] == bindparam(name)
+            for name, is_null in shape
+        )
+    )
+
+
+def get_filters_params(filters: Mapping[str, Any]) -> dict[str, Any]:
+    return {name: value for name, value in filters.items() if value is not None}
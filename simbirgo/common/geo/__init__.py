@@ -0,0 +1 @@
+from .distance import EARTH_RADIUS, haversine, min_distance_for_degrees
@@ -0,0 +1,164 @@
+from typing import Iterator
+
+import numpy as np
+
+from .distance import EARTH_RADIUS
+
+# Upper bound of (queries x positions) elements materialised at once by batch methods
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class FleetPositions:
+    """Fleet coordinates as contiguous float64 arrays for vectorised batch queries.
+
+    Every query method accepts many query points at once and returns one row per
+    query point. Large batches are split into chunks so that no more than
+    `chunk_size` pairwise distances exist in memory at any time.
+    """
+
+    def __init__(
+        self,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self._latitudes = np.ascontiguousarray(latitudes, dtype=np.float64)
+        self._longitudes = np.ascontiguousarray(longitudes, dtype=np.float64)
+        if self._latitudes.shape != self._longitudes.shape or self._latitudes.ndim != 1:
+            raise ValueError("Latitudes and longitudes must be one-dimensional of equal length")
+
+        self._phi = np.radians(self._latitudes)
+        self._lambda = np.radians(self._longitudes)
+        self._cos_phi = np.cos(self._phi)
+        self._chunk_size = chunk_size
+
+    @classmethod
+    def from_buffers(cls, latitudes, longitudes, **kwargs) -> "FleetPositions":
+        """Wrap float64 buffers (e.g. `array.array("d")`) without copying them."""
+        return cls(
+            np.frombuffer(latitudes, dtype=np.float64),
+            np.frombuffer(longitudes, dtype=np.float64),
+            **kwargs,
+        )
+
+    def __len__(self) -> int:
+        return self._latitudes.shape[0]
+
+    @property
+    def latitudes(self) -> np.ndarray:
+        return self._latitudes
+
+    @property
+    def longitudes(self) -> np.ndarray:
+        return self._longitudes
+
+    def _iter_chunks(self, queries_count: int) -> Iterator[slice]:
+        step = max(1, self._chunk_size // max(1, len(self)))
+        for start in range(0, queries_count, step):
+            yield slice(start, min(start + step, queries_count))
+
+    def _haversine(self, phi: np.ndarray, lambda_: np.ndarray) -> np.ndarray:
+        """Distances in metres, `phi` and `lambda_` are query columns in radians."""
+        a = (
+            np.sin((self._phi - phi) / 2) ** 2
+            + np.cos(phi) * self._cos_phi * np.sin((self._lambda - lambda_) / 2) ** 2
+        )
+        np.clip(a, 0.0, 1.0, out=a)
+        return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+    def distances(self, latitudes, longitudes) -> np.ndarray:
+        """(queries, positions) matrix of great-circle distances in metres."""
+        phi = np.radians(np.atleast_1d(np.asarray(latitudes, dtype=np.float64)))[:, None]
+        lambda_ = np.radians(np.atleast_1d(np.asarray(longitudes, dtype=np.float64)))[:, None]
+
+        result = np.empty((phi.shape[0], len(self)), dtype=np.float64)
+        for chunk in self._iter_chunks(phi.shape[0]):
+            result[chunk] = self._haversine(phi[chunk], lambda_[chunk])
+
+        return result
+
+    def bounding_box_mask(
+        self,
+        latitudes_min,
+        latitudes_max,
+        longitudes_min,
+        longitudes_max,
+    ) -> np.ndarray:
+        """(boxes, positions) boolean matrix of positions inside each box."""
+        latitudes_min = np.atleast_1d(np.asarray(latitudes_min, dtype=np.float64))[:, None]
+        latitudes_max = np.atleast_1d(np.asarray(latitudes_max, dtype=np.float64))[:, None]
+        longitudes_min = np.atleast_1d(np.asarray(longitudes_min, dtype=np.float64))[:, None]
+        longitudes_max = np.atleast_1d(np.asarray(longitudes_max, dtype=np.float64))[:, None]
+
+        return (
+            (self._latitudes >= latitudes_min)
+            & (self._latitudes <= latitudes_max)
+            & (self._longitudes >= longitudes_min)
+            & (self._longitudes <= longitudes_max)
+        )
+
+    def within_radius(self, latitudes, longitudes, radius) -> np.ndarray:
+        """(queries, positions) boolean matrix of positions within `radius` metres."""
+        phi = np.radians(np.atleast_1d(np.asarray(latitudes, dtype=np.float64)))[:, None]
+        lambda_ = np.radians(np.atleast_1d(np.asarray(longitudes, dtype=np.float64)))[:, None]
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), (phi.shape[0],))[:, None]
+
+        result = np.empty((phi.shape[0], len(self)), dtype=bool)
+        for chunk in self._iter_chunks(phi.shape[0]):
+            result[chunk] = self._haversine(phi[chunk], lambda_[chunk]) <= radius[chunk]
+
+        return result
+
+    def count_within_radius(self, latitudes, longitudes, radius) -> np.ndarray:
+        """Number of positions within `radius` metres of every query point."""
+        phi = np.radians(np.atleast_1d(np.asarray(latitudes, dtype=np.float64)))[:, None]
+        lambda_ = np.radians(np.atleast_1d(np.asarray(longitudes, dtype=np.float64)))[:, None]
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), (phi.shape[0],))[:, None]
+
+        result = np.empty(phi.shape[0], dtype=np.int64)
+        for chunk in self._iter_chunks(phi.shape[0]):
+            distances = self._haversine(phi[chunk], lambda_[chunk])
+            result[chunk] = np.count_nonzero(distances <= radius[chunk], axis=1)
+
+        return result
+
+    def top_k(self, latitudes, longitudes, k: int, mask: np.ndarray | None = None):
+        """Indices and distances of the `k` nearest positions for every query point.
+
+        Returns two (queries, k) arrays ordered nearest first. Positions excluded by
+        `mask` (a (positions,) or (queries, positions) boolean array) and missing
+        neighbours get index -1 and distance `inf`.
+        """
+        phi = np.radians(np.atleast_1d(np.asarray(latitudes, dtype=np.float64)))[:, None]
+        lambda_ = np.radians(np.atleast_1d(np.asarray(longitudes, dtype=np.float64)))[:, None]
+        if mask is not None:
+            mask = np.broadcast_to(mask, (phi.shape[0], len(self)))
+
+        queries_count = phi.shape[0]
+        indices = np.full((queries_count, k), -1, dtype=np.int64)
+        distances = np.full((queries_count, k), np.inf, dtype=np.float64)
+        available = min(k, len(self))
+        if available == 0:
+            return indices, distances
+
+        for chunk in self._iter_chunks(queries_count):
+            chunk_distances = self._haversine(phi[chunk], lambda_[chunk])
+            if mask is not None:
+                chunk_distances[~mask[chunk]] = np.inf
+
+            if available < len(self):
+                candidates = np.argpartition(chunk_distances, available - 1, axis=1)
+                candidates = candidates[:, :available]
+            else:
+                candidates = np.broadcast_to(np.arange(len(self)), chunk_distances.shape)
+            candidates_distances = np.take_along_axis(chunk_distances, candidates, axis=1)
+
+            order = np.argsort(candidates_distances, axis=1, kind="stable")
+            chunk_indices = np.take_along_axis(candidates, order, axis=1)
+            chunk_distances = np.take_along_axis(candidates_distances, order, axis=1)
+            chunk_indices[np.isinf(chunk_distances)] = -1
+
+            indices[chunk, :available] = chunk_indices
+            distances[chunk, :available] = chunk_distances
+
+        return indices, distances
@@ -0,0 +1,32 @@
+import math
+
+EARTH_RADIUS = 6_371_008.8  # metres
+
+
+def haversine(latitude1: float, longitude1: float, latitude2: float, longitude2: float) -> float:
+    """Great-circle distance between two points in metres."""
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    half_delta_phi = (phi2 - phi1) / 2
+    half_delta_lambda = math.radians(longitude2 - longitude1) / 2
+
+    a = (
+        math.sin(half_delta_phi) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(half_delta_lambda) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def min_distance_for_degrees(max_abs_latitude: float, degrees: float) -> float:
+    """Lower bound in metres of the distance between two points which differ by at least
+    `degrees` in latitude or in longitude, with both latitudes within `max_abs_latitude`.
+    """
+    if degrees <= 0:
+        return 0.0
+
+    degrees = min(degrees, 180.0)
+    max_cos = math.cos(math.radians(min(max_abs_latitude, 90.0)))
+    by_latitude = EARTH_RADIUS * math.radians(degrees)
+    by_longitude = 2 * EARTH_RADIUS * math.asin(max_cos * math.sin(math.radians(degrees) / 2))
+
+    return min(by_latitude, by_longitude)
@@ -1 +1,3 @@
+from .blacklist import BaseTokenBlacklist, MemoryTokenBlacklist, TokenBlacklistBackendEnum
+from .keyring import JWTAlgorithmEnum, JWTKey, KeyRing
 from .methods import JWTMethods, get_jwt_methods
@@ -0,0 +1,68 @@
+import enum
+import hashlib
+import heapq
+import time
+
+from facet import ServiceMixin
+
+
+class TokenBlacklistBackendEnum(str, enum.Enum):
+    MEMORY = "memory"
+    DATABASE = "database"
+
+
+def get_token_id(token: str, payload: dict) -> str:
+    """`jti` claim of the token, hash of the token for tokens issued without it."""
+    return payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+
+class BaseTokenBlacklist(ServiceMixin):
+    async def add(self, token_id: str, expires_at: float):
+        raise NotImplementedError
+
+    def __contains__(self, token_id: str) -> bool:
+        raise NotImplementedError
+
+
+class MemoryTokenBlacklist(BaseTokenBlacklist):
+    """Revoked token ids of the current process, kept only until the tokens expire.
+
+    Expired entries are evicted in expiry order from a heap on every add/lookup,
+    so the blacklist never outgrows the number of revoked, still valid tokens.
+    """
+
+    def __init__(self):
+        self._expires_at: dict[str, float] = {}
+        self._expiration_queue: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def _evict_expired(self, now: float):
+        queue = self._expiration_queue
+        while queue and queue[0][0] <= now:
+            expires_at, token_id = heapq.heappop(queue)
+            # Entry may be re-added later with another expiration time
+            if self._expires_at.get(token_id) == expires_at:
+                del self._expires_at[token_id]
+
+    def add_local(self, token_id: str, expires_at: float):
+        now = time.time()
+        self._evict_expired(now)
+        if expires_at <= now or self._expires_at.get(token_id, 0) >= expires_at:
+            return
+
+        self._expires_at[token_id] = expires_at
+        heapq.heappush(self._expiration_queue, (expires_at, token_id))
+
+    async def add(self, token_id: str, expires_at: float):
+        self.add_local(token_id, expires_at)
+
+    def __contains__(self, token_id: str) -> bool:
+        expires_at = self._expires_at.get(token_id)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            self._evict_expired(time.time())
+            return False
+        return True
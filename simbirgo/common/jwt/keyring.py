@@ -0,0 +1,204 @@
+import enum
+import hashlib
+from typing import Any, Callable, Iterable
+
+import jwt
+from cryptography.hazmat.primitives import serialization as crypto_serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt.algorithms import get_default_algorithms
+
+from simbirgo.common.utils.rsa256 import generate_rsa_keys
+
+
+class JWTAlgorithmEnum(str, enum.Enum):
+    RS256 = "RS256"
+    ES256 = "ES256"
+    EDDSA = "EdDSA"
+
+
+class JWTKey:
+    """Parsed key pair of one algorithm. Keys without private part only verify tokens."""
+
+    def __init__(
+        self,
+        algorithm: JWTAlgorithmEnum,
+        public_key: str | None = None,
+        private_key: str | None = None,
+        kid: str | None = None,
+    ):
+        self.algorithm = JWTAlgorithmEnum(algorithm)
+
+        jwt_algorithm = get_default_algorithms()[self.algorithm.value]
+        self._private_key = None if private_key is None else jwt_algorithm.prepare_key(private_key)
+        if public_key is not None:
+            self._public_key = jwt_algorithm.prepare_key(public_key)
+        elif self._private_key is not None:
+            self._public_key = self._private_key.public_key()
+        else:
+            raise ValueError("Either public or private key is required")
+
+        self.kid = kid or self.get_fingerprint()
+
+    @classmethod
+    def generate(cls, algorithm: JWTAlgorithmEnum, kid: str | None = None) -> "JWTKey":
+        algorithm = JWTAlgorithmEnum(algorithm)
+        if algorithm == JWTAlgorithmEnum.RS256:
+            keys = generate_rsa_keys()
+            return cls(algorithm, keys.public_key, keys.private_key, kid=kid)
+
+        if algorithm == JWTAlgorithmEnum.ES256:
+            private_key = ec.generate_private_key(ec.SECP256R1())
+        else:
+            private_key = ed25519.Ed25519PrivateKey.generate()
+
+        public_pem = private_key.public_key().public_bytes(
+            crypto_serialization.Encoding.PEM,
+            crypto_serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        private_pem = private_key.private_bytes(
+            crypto_serialization.Encoding.PEM,
+            crypto_serialization.PrivateFormat.PKCS8,
+            crypto_serialization.NoEncryption(),
+        )
+        return cls(algorithm, public_pem.decode(), private_pem.decode(), kid=kid)
+
+    @property
+    def can_sign(self) -> bool:
+        return self._private_key is not None
+
+    def get_private_pem(self) -> str:
+        if self._private_key is None:
+            raise ValueError(f"Key '{self.kid}' has no private key")
+        return self._private_key.private_bytes(
+            crypto_serialization.Encoding.PEM,
+            crypto_serialization.PrivateFormat.PKCS8,
+            crypto_serialization.NoEncryption(),
+        ).decode()
+
+    def get_fingerprint(self) -> str:
+        public_der = self._public_key.public_bytes(
+            crypto_serialization.Encoding.DER,
+            crypto_serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        return hashlib.sha256(public_der).hexdigest()[:16]
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        if self._private_key is None:
+            raise ValueError(f"Key '{self.kid}' has no private key")
+
+        return jwt.encode(
+            payload,
+            self._private_key,
+            algorithm=self.algorithm.value,
+            headers={"kid": self.kid},
+        )
+
+    def decode(self, token: str, options: dict[str, Any] | None = None) -> dict[str, Any]:
+        return jwt.decode(
+            token,
+            self._public_key,
+            algorithms=[self.algorithm.value],
+            options=options,
+        )
+
+
+class KeyRing:
+    """Set of verification keys picked by the `kid` header, one of them signs new tokens.
+
+    Keys can be added, rotated and removed at runtime: tokens signed by a key stay
+    valid for as long as the key stays in the ring. `loader` supplies the primary key
+    on first use, so that key material is not read or generated before it is needed.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[JWTKey] = (),
+        signing_kid: str | None = None,
+        loader: Callable[[], JWTKey] | None = None,
+    ):
+        self._keys: dict[str, JWTKey] = {key.kid: key for key in keys}
+        self._signing_key: JWTKey | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._loader = loader
+
+        if signing_kid is not None:
+            self.set_signing_key(signing_kid)
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._keys)
+
+    def __contains__(self, kid: str) -> bool:
+        self._load()
+        return kid in self._keys
+
+    def _load(self):
+        if self._loader is None:
+            return
+
+        loader, self._loader = self._loader, None
+        key = loader()
+        self.add_key(key, signing=key.can_sign and self._signing_key is None)
+
+    @property
+    def signing_key(self) -> JWTKey:
+        self._load()
+        if self._signing_key is None:
+            raise ValueError("Key ring has no signing key")
+        return self._signing_key
+
+    def add_listener(self, listener: Callable[[], None]):
+        """Call `listener` whenever a verification key is removed."""
+        self._listeners.append(listener)
+
+    def get_key(self, kid: str) -> JWTKey | None:
+        self._load()
+        return self._keys.get(kid)
+
+    def add_key(self, key: JWTKey, signing: bool = False):
+        self._keys = {**self._keys, key.kid: key}
+        if signing:
+            self.set_signing_key(key.kid)
+
+    def set_signing_key(self, kid: str):
+        self._load()
+        key = self._keys[kid]
+        if not key.can_sign:
+            raise ValueError(f"Key '{kid}' has no private key")
+        self._signing_key = key
+
+    def rotate(self, key: JWTKey):
+        """Sign with `key` from now on, previous keys keep verifying issued tokens."""
+        self.add_key(key, signing=True)
+
+    def remove_key(self, kid: str):
+        self._load()
+        if self._signing_key is not None and self._signing_key.kid == kid:
+            raise ValueError(f"Key '{kid}' is used for signing")
+
+        self._keys = {i: key for i, key in self._keys.items() if i != kid}
+        for listener in self._listeners:
+            listener()
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        return self.signing_key.encode(payload)
+
+    def decode(self, token: str, options: dict[str, Any] | None = None) -> dict[str, Any]:
+        self._load()
+        header = jwt.get_unverified_header(token)
+
+        kid = header.get("kid")
+        if kid is not None:
+            key = self._keys.get(kid)
+            if key is None:
+                raise jwt.InvalidKeyError(f"Unknown key '{kid}'")
+            return key.decode(token, options=options)
+
+        # Tokens issued before key ids were introduced
+        candidates = [key for key in self._keys.values() if key.algorithm == header.get("alg")]
+        for key in candidates:
+            try:
+                return key.decode(token, options=options)
+            except jwt.InvalidSignatureError:
+                continue
+        raise jwt.InvalidSignatureError("Signature verification failed")
@@ -1,106 +1,194 @@
 import datetime
+import os
+import pathlib
 import uuid
+from typing import Callable
 
 import jwt
+from loguru import logger
 
-from .settings import JWTSettings
+from simbirgo.common.utils.cache import TTLCache
 
+from .blacklist import BaseTokenBlacklist, MemoryTokenBlacklist, get_token_id
+from .keyring import JWTAlgorithmEnum, JWTKey, KeyRing
+from .settings import JWTKeySettings, JWTSettings
 
-class JWTMethods:
-    BLACK_LIST_JWT = set()
 
+class JWTMethods:
     def __init__(
         self,
-        access_token_public_key: str,
-        access_token_private_key: str,
-        refresh_token_public_key: str,
-        refresh_token_private_key: str,
+        access_token_key_ring: KeyRing,
+        refresh_token_key_ring: KeyRing,
         access_token_expires: datetime.timedelta,
         refresh_token_expires: datetime.timedelta,
+        access_token_cache_size: int = 10_000,
+        blacklist: BaseTokenBlacklist | None = None,
     ) -> None:
-        self.access_token_public_key: str = access_token_public_key
-        self.access_token_private_key: str = access_token_private_key
-        self.refresh_token_public_key: str = refresh_token_public_key
-        self.refresh_token_private_key: str = refresh_token_private_key
+        self.access_token_key_ring: KeyRing = access_token_key_ring
+        self.refresh_token_key_ring: KeyRing = refresh_token_key_ring
         self.access_token_expires: datetime.timedelta = access_token_expires
         self.refresh_token_expires: datetime.timedelta = refresh_token_expires
+        self.blacklist: BaseTokenBlacklist = (
+            MemoryTokenBlacklist() if blacklist is None else blacklist
+        )
+
+        # (user id, token id) of verified access tokens, to skip signature verification
+        # on every request
+        self.access_token_cache = TTLCache(maxsize=access_token_cache_size)
+        self.access_token_key_ring.add_listener(self.access_token_cache.clear)
 
     def issue_access_token(self, user_id: uuid.UUID) -> str:
-        access_token = jwt.encode(
+        return self.access_token_key_ring.encode(
             {
                 "user_id": str(user_id),
+                "jti": uuid.uuid4().hex,
                 "exp": int(
                     datetime.datetime.now().timestamp() + self.access_token_expires.total_seconds()
                 )
                 + 1,
             },
-            self.access_token_private_key,
-            algorithm="RS256",
         )
-        self.remove_from_blacklist(access_token)
-        return access_token
 
     def decode_access_token(self, access_token: str) -> uuid.UUID | None:
-        if self.is_token_blacklisted(access_token):
-            return None
-
-        try:
-            return uuid.UUID(
-                jwt.decode(
+        cached = self.access_token_cache.get(access_token)
+        if cached is None:
+            try:
+                payload = self.access_token_key_ring.decode(
                     access_token,
-                    self.access_token_public_key,
-                    algorithms=["RS256"],
-                    options={"require": ["user_id"]},
-                ).get("user_id")
-            )
-        except jwt.PyJWTError:
+                    options={"require": ["user_id", "exp"]},
+                )
+                cached = uuid.UUID(payload["user_id"]), get_token_id(access_token, payload)
+            except (jwt.PyJWTError, ValueError):
+                return None
+
+            self.access_token_cache.set(access_token, cached, expires_at=payload["exp"])
+
+        user_id, token_id = cached
+        if token_id in self.blacklist:
             return None
 
+        return user_id
+
     def issue_refresh_token(self, user_id: uuid.UUID) -> str:
-        return jwt.encode(
+        return self.refresh_token_key_ring.encode(
             {
                 "user_id": str(user_id),
+                "jti": uuid.uuid4().hex,
                 "exp": int(
                     datetime.datetime.now().timestamp() + self.refresh_token_expires.total_seconds()
                 )
                 + 1,
             },
-            self.refresh_token_private_key,
-            algorithm="RS256",
         )
 
     def decode_refresh_token(self, refresh_token: str) -> uuid.UUID | None:
         try:
             return uuid.UUID(
-                jwt.decode(
+                self.refresh_token_key_ring.decode(
                     refresh_token,
-                    self.refresh_token_public_key,
-                    algorithms=["RS256"],
                     options={"require": ["user_id"]},
                 ).get("user_id")
             )
-        except jwt.PyJWTError:
+        except (jwt.PyJWTError, ValueError):
             return None
 
-    def remove_from_blacklist(self, token: str) -> None:
+    async def add_to_blacklist(self, token: str) -> None:
+        """Revoke a valid access token until it expires, invalid tokens are ignored."""
         try:
-            self.BLACK_LIST_JWT.remove(token)
-        except KeyError:
-            pass
+            payload = self.access_token_key_ring.decode(token, options={"require": ["exp"]})
+        except jwt.PyJWTError:
+            return
 
-    def add_to_blacklist(self, token: str) -> None:
-        self.BLACK_LIST_JWT.add(token)
+        await self.blacklist.add(get_token_id(token, payload), payload["exp"])
 
     def is_token_blacklisted(self, token: str) -> bool:
-        return token in self.BLACK_LIST_JWT
+        try:
+            payload = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            return False
+        return get_token_id(token, payload) in self.blacklist
+
+
+def load_key_file(path: pathlib.Path, algorithm: JWTAlgorithmEnum) -> JWTKey:
+    """Read the key stored in `path`, generating and storing it first if there is none.
+
+    The file is published with a hard link, so workers starting at the same time
+    end up with the key of whichever of them was first.
+    """
+    if not path.exists():
+        key = JWTKey.generate(algorithm)
+        key_settings = JWTKeySettings(
+            algorithm=algorithm, private_key=key.get_private_pem(), kid=key.kid
+        )
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}")
+        with open(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            f.write(key_settings.model_dump_json())
+        try:
+            os.link(temporary_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            temporary_path.unlink()
+
+    return JWTKey(**JWTKeySettings.model_validate_json(path.read_text()).model_dump())
+
 
+def get_key_loader(
+    algorithm: JWTAlgorithmEnum,
+    private_key: str | None,
+    public_key: str | None,
+    key_file: pathlib.Path | None,
+) -> Callable[[], JWTKey]:
+    def load() -> JWTKey:
+        if private_key is not None or public_key is not None:
+            return JWTKey(algorithm=algorithm, private_key=private_key, public_key=public_key)
+        if key_file is not None:
+            return load_key_file(key_file, algorithm)
+
+        logger.warning(
+            "JWT keys are not configured, generating ephemeral {algorithm} key",
+            algorithm=algorithm.value,
+        )
+        return JWTKey.generate(algorithm)
+
+    return load
+
+
+def get_key_ring(
+    loader: Callable[[], JWTKey],
+    verification_keys: list[JWTKeySettings],
+) -> KeyRing:
+    return KeyRing(
+        [JWTKey(**key_settings.model_dump()) for key_settings in verification_keys],
+        loader=loader,
+    )
+
+
+def get_jwt_methods(
+    settings: JWTSettings,
+    blacklist: BaseTokenBlacklist | None = None,
+) -> JWTMethods:
+    keys_dir = settings.jwt_keys_dir
+    access_token_loader = get_key_loader(
+        algorithm=settings.jwt_algorithm,
+        private_key=settings.jwt_access_token_private_key,
+        public_key=settings.jwt_access_token_public_key,
+        key_file=None if keys_dir is None else keys_dir / "access_token.json",
+    )
+    refresh_token_loader = get_key_loader(
+        algorithm=settings.jwt_algorithm,
+        private_key=settings.jwt_refresh_token_private_key,
+        public_key=settings.jwt_refresh_token_public_key,
+        key_file=None if keys_dir is None else keys_dir / "refresh_token.json",
+    )
 
-def get_jwt_methods(settings: JWTSettings) -> JWTMethods:
     return JWTMethods(
-        access_token_private_key=settings.jwt_access_token_private_key,
-        access_token_public_key=settings.jwt_access_token_public_key,
-        refresh_token_private_key=settings.jwt_refresh_token_private_key,
-        refresh_token_public_key=settings.jwt_refresh_token_public_key,
+        access_token_key_ring=get_key_ring(access_token_loader, settings.jwt_access_token_keys),
+        refresh_token_key_ring=get_key_ring(refresh_token_loader, settings.jwt_refresh_token_keys),
         access_token_expires=settings.jwt_access_token_expires,
         refresh_token_expires=settings.jwt_access_token_expires,
+        access_token_cache_size=settings.jwt_access_token_cache_size,
+        blacklist=blacklist,
     )
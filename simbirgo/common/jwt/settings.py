@@ -1,17 +1,35 @@
 import datetime
+import pathlib
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
-from simbirgo.common.utils.rsa256 import generate_rsa_keys
+from .blacklist import TokenBlacklistBackendEnum
+from .keyring import JWTAlgorithmEnum
 
-access_token = generate_rsa_keys()
-refresh_token = generate_rsa_keys()
+
+class JWTKeySettings(BaseModel):
+    algorithm: JWTAlgorithmEnum
+    public_key: str | None = None
+    private_key: str | None = None
+    kid: str | None = None
 
 
 class JWTSettings(BaseSettings):
-    jwt_access_token_private_key: str = access_token.private_key
-    jwt_access_token_public_key: str = access_token.public_key
-    jwt_refresh_token_private_key: str = refresh_token.private_key
-    jwt_refresh_token_public_key: str = refresh_token.public_key
+    jwt_algorithm: JWTAlgorithmEnum = JWTAlgorithmEnum.RS256
+    # Without configured keys they are read from (or generated into) `jwt_keys_dir`,
+    # ephemeral keys are generated when the directory is not set either
+    jwt_access_token_private_key: str | None = None
+    jwt_access_token_public_key: str | None = None
+    jwt_refresh_token_private_key: str | None = None
+    jwt_refresh_token_public_key: str | None = None
+    jwt_keys_dir: pathlib.Path | None = None
+    # Extra keys accepted for verification, e.g. previous keys during rotation
+    jwt_access_token_keys: list[JWTKeySettings] = []
+    jwt_refresh_token_keys: list[JWTKeySettings] = []
     jwt_access_token_expires: datetime.timedelta = datetime.timedelta(minutes=5)
     jwt_refresh_token_expires: datetime.timedelta = datetime.timedelta(days=30)
+    jwt_access_token_cache_size: int = 10_000
+    jwt_blacklist_backend: TokenBlacklistBackendEnum = TokenBlacklistBackendEnum.DATABASE
+    # Seconds until a sign-out on one worker is enforced by the others
+    jwt_blacklist_poll_interval: float = 1.0
@@ -0,0 +1,2 @@
+from .settings import OutboxSettings, OutboxSinkEnum
+from .sinks import BaseOutboxSink, FileOutboxSink, MemoryOutboxSink, OutboxEvent, get_outbox_sink
@@ -0,0 +1,45 @@
+import asyncio
+import json
+from typing import Sequence
+
+from aiokafka import AIOKafkaProducer
+
+from .sinks import BaseOutboxSink, OutboxEvent
+
+
+class KafkaOutboxSink(BaseOutboxSink):
+    """Events sent to the Kafka topics named by `OutboxEvent.topic`, keyed by their keys.
+
+    A batch is published once every event of it is acknowledged by all in-sync replicas.
+    """
+
+    def __init__(self, bootstrap_servers: str, client_id: str = "simbirgo"):
+        self._bootstrap_servers = bootstrap_servers
+        self._client_id = client_id
+        self._producer: AIOKafkaProducer | None = None
+
+    async def start(self):
+        # The producer binds to the running loop, so it can't be created in __init__
+        self._producer = AIOKafkaProducer(
+            bootstrap_servers=self._bootstrap_servers,
+            client_id=self._client_id,
+            acks="all",
+            enable_idempotence=True,
+        )
+        await self._producer.start()
+
+    async def stop(self):
+        if self._producer is not None:
+            await self._producer.stop()
+
+    async def publish(self, events: Sequence[OutboxEvent]):
+        deliveries = []
+        for event in events:
+            deliveries.append(
+                await self._producer.send(
+                    event.topic,
+                    value=json.dumps(event.payload).encode(),
+                    key=event.key.encode() if event.key is not None else None,
+                )
+            )
+        await asyncio.gather(*deliveries)
@@ -0,0 +1,23 @@
+import enum
+import pathlib
+
+from pydantic import PositiveFloat, PositiveInt
+from pydantic_settings import BaseSettings
+
+
+class OutboxSinkEnum(str, enum.Enum):
+    KAFKA = "kafka"
+    FILE = "file"
+    MEMORY = "memory"
+
+
+class OutboxSettings(BaseSettings):
+    # Without a sink events are kept in the outbox until one is configured
+    outbox_sink: OutboxSinkEnum | None = None
+    outbox_file_path: pathlib.Path = pathlib.Path("outbox.jsonl")
+    outbox_kafka_bootstrap_servers: str = "kafka:9092"
+    outbox_kafka_client_id: str = "simbirgo"
+    outbox_batch_size: PositiveInt = 500
+    # Seconds between polls for events committed by other workers
+    outbox_poll_interval: PositiveFloat = 1.0
+    outbox_max_backoff: PositiveFloat = 60
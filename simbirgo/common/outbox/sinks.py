@@ -0,0 +1,63 @@
+import asyncio
+import pathlib
+from datetime import datetime
+from typing import Any, Sequence
+
+import aiofiles
+from facet import ServiceMixin
+from pydantic import BaseModel
+
+from .settings import OutboxSettings, OutboxSinkEnum
+
+
+class OutboxEvent(BaseModel):
+    id: int
+    topic: str
+    key: str | None
+    payload: dict[str, Any]
+    created_at: datetime
+
+
+class BaseOutboxSink(ServiceMixin):
+    async def publish(self, events: Sequence[OutboxEvent]):
+        """Deliver all `events` or raise, a failed batch is published again later."""
+        raise NotImplementedError
+
+
+class MemoryOutboxSink(BaseOutboxSink):
+    """Events published into a queue of the current process, a stand-in for tests."""
+
+    def __init__(self, maxsize: int = 0):
+        self.queue: asyncio.Queue[OutboxEvent] = asyncio.Queue(maxsize=maxsize)
+
+    async def publish(self, events: Sequence[OutboxEvent]):
+        for event in events:
+            await self.queue.put(event)
+
+
+class FileOutboxSink(BaseOutboxSink):
+    """Events appended to a JSON Lines file, one line per event."""
+
+    def __init__(self, path: pathlib.Path):
+        self._path = path
+
+    async def publish(self, events: Sequence[OutboxEvent]):
+        lines = "".join(event.model_dump_json() + "\n" for event in events)
+        async with aiofiles.open(self._path, "a", encoding="utf-8") as file:
+            await file.write(lines)
+
+
+def get_outbox_sink(settings: OutboxSettings) -> BaseOutboxSink | None:
+    if settings.outbox_sink == OutboxSinkEnum.KAFKA:
+        from .kafka import KafkaOutboxSink  # pylint: disable=import-outside-toplevel
+
+        return KafkaOutboxSink(
+            bootstrap_servers=settings.outbox_kafka_bootstrap_servers,
+            client_id=settings.outbox_kafka_client_id,
+        )
+    if settings.outbox_sink == OutboxSinkEnum.FILE:
+        return FileOutboxSink(path=settings.outbox_file_path)
+    if settings.outbox_sink == OutboxSinkEnum.MEMORY:
+        return MemoryOutboxSink()
+
+    return None
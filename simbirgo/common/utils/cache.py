@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from pydantic import BaseModel
+
+
+class CacheStatistics(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire at their own wall-clock time."""
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get_statistics(self) -> CacheStatistics:
+        return CacheStatistics(
+            size=len(self._data),
+            maxsize=self._maxsize,
+            hits=self._hits,
+            misses=self._misses,
+        )
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self._misses += 1
+            return default
+
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            self._misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None):
+        """Store `value` until `expires_at` (unix time), by default for `ttl` seconds."""
+        if expires_at is None and self._ttl is not None:
+            expires_at = time.time() + self._ttl
+
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self):
+        self._data.clear()
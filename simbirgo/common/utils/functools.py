@@ -1,4 +1,8 @@
 from functools import reduce
+from itertools import islice
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
 
 
 def get_nested(storage: dict, *keys):
@@ -7,3 +11,9 @@ def get_nested(storage: dict, *keys):
         keys,
         storage,
     )
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
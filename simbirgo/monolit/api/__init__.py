@@ -1,2 +1,3 @@
 from .cli import get_cli
 from .service import get_service
+from .token_blacklist import get_token_blacklist
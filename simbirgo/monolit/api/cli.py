@@ -8,14 +8,18 @@ from simbirgo.monolit import database
 from simbirgo.monolit.settings import MonolitSettings
 
 from .service import get_service
+from .token_blacklist import get_token_blacklist
 
 
 @logger.catch
 def run(ctx: typer.Context):
     settings: MonolitSettings = ctx.obj["settings"]
 
-    jwt_methods = jwt.get_jwt_methods(settings=settings)
     database_service = database.get_service(settings=settings)
+    jwt_methods = jwt.get_jwt_methods(
+        settings=settings,
+        blacklist=get_token_blacklist(database=database_service, settings=settings),
+    )
     api_service = get_service(
         database=database_service,
         jwt_methods=jwt_methods,
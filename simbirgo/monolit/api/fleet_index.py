@@ -0,0 +1,313 @@
+import heapq
+import math
+import uuid
+from array import array
+from datetime import datetime
+from typing import Iterable, Iterator, Sequence
+
+from simbirgo.common.geo import haversine, min_distance_for_degrees
+from simbirgo.monolit.database.models import Transport, TransportTypeEnum
+
+TRANSPORT_TYPE_CODES = {
+    transport_type: code for code, transport_type in enumerate(TransportTypeEnum)
+}
+
+
+class FleetIndex:
+    """In-memory positions of the fleet with a uniform grid over (latitude, longitude).
+
+    Vehicle attributes are kept in parallel arrays addressed by slot, the grid maps
+    a cell to the slots inside it. Deleted slots are reused by the next insert.
+    """
+
+    def __init__(self, cell_size: float = 0.01):
+        self._cell_size = cell_size
+        self._loaded = False
+        self._journal: list[tuple] | None = None
+        self._clear()
+
+    def _clear(self):
+        self._ids: list[uuid.UUID | None] = []
+        self._types = array("b")
+        self._latitudes = array("d")
+        self._longitudes = array("d")
+        self._can_be_rented = array("b")
+        self._created_at = array("d")
+        self._slots: dict[uuid.UUID, int] = {}
+        self._free_slots: list[int] = []
+        self._cells: dict[tuple[int, int], set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def _get_cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return math.floor(latitude / self._cell_size), math.floor(longitude / self._cell_size)
+
+    def begin_load(self):
+        """Start recording changes that must be replayed over the loaded snapshot."""
+        self._journal = []
+
+    def finish_load(self, rows: Iterable[Sequence]):
+        """Replace the index content with `rows` of
+        (id, transportType, latitude, longitude, canBeRented, created_at).
+        """
+        journal, self._journal = self._journal or [], None
+
+        self._clear()
+        for row in rows:
+            self.upsert(*row)
+        for method, args in journal:
+            method(*args)
+
+        self._loaded = True
+
+    def upsert(
+        self,
+        transport_id: uuid.UUID,
+        transport_type: TransportTypeEnum,
+        latitude: float,
+        longitude: float,
+        can_be_rented: bool,
+        created_at: datetime,
+    ):
+        if self._journal is not None:
+            self._journal.append(
+                (
+                    self.upsert,
+                    (transport_id, transport_type, latitude, longitude, can_be_rented, created_at),
+                )
+            )
+
+        slot = self._slots.get(transport_id)
+        if slot is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = len(self._ids)
+                self._ids.append(None)
+                self._types.append(0)
+                self._latitudes.append(0.0)
+                self._longitudes.append(0.0)
+                self._can_be_rented.append(0)
+                self._created_at.append(0.0)
+            self._ids[slot] = transport_id
+            self._slots[transport_id] = slot
+        else:
+            self._discard_from_cell(slot)
+
+        self._types[slot] = TRANSPORT_TYPE_CODES[TransportTypeEnum(transport_type)]
+        self._latitudes[slot] = latitude
+        self._longitudes[slot] = longitude
+        self._can_be_rented[slot] = bool(can_be_rented)
+        self._created_at[slot] = created_at.timestamp()
+        self._cells.setdefault(self._get_cell(latitude, longitude), set()).add(slot)
+
+    def move(self, transport_id: uuid.UUID, latitude: float, longitude: float):
+        if self._journal is not None:
+            self._journal.append((self.move, (transport_id, latitude, longitude)))
+
+        slot = self._slots.get(transport_id)
+        if slot is None:
+            return
+
+        self._discard_from_cell(slot)
+        self._latitudes[slot] = latitude
+        self._longitudes[slot] = longitude
+        self._cells.setdefault(self._get_cell(latitude, longitude), set()).add(slot)
+
+    def remove(self, transport_id: uuid.UUID):
+        if self._journal is not None:
+            self._journal.append((self.remove, (transport_id,)))
+
+        slot = self._slots.pop(transport_id, None)
+        if slot is None:
+            return
+
+        self._discard_from_cell(slot)
+        self._ids[slot] = None
+        self._free_slots.append(slot)
+
+    def _discard_from_cell(self, slot: int):
+        cell = self._get_cell(self._latitudes[slot], self._longitudes[slot])
+        cell_slots = self._cells.get(cell)
+        if cell_slots is None:
+            return
+        cell_slots.discard(slot)
+        if not cell_slots:
+            del self._cells[cell]
+
+    def _iter_box_slots(
+        self,
+        latitude_min: float,
+        latitude_max: float,
+        longitude_min: float,
+        longitude_max: float,
+    ) -> Iterable[int]:
+        cell_min_x, cell_min_y = self._get_cell(latitude_min, longitude_min)
+        cell_max_x, cell_max_y = self._get_cell(latitude_max, longitude_max)
+        box_cells_count = (cell_max_x - cell_min_x + 1) * (cell_max_y - cell_min_y + 1)
+
+        if box_cells_count > len(self._cells):
+            cells = (
+                cell_slots
+                for (x, y), cell_slots in self._cells.items()
+                if cell_min_x <= x <= cell_max_x and cell_min_y <= y <= cell_max_y
+            )
+        else:
+            cells = (
+                self._cells.get((x, y), ())
+                for x in range(cell_min_x, cell_max_x + 1)
+                for y in range(cell_min_y, cell_max_y + 1)
+            )
+
+        for cell_slots in cells:
+            yield from cell_slots
+
+    def _get_order_key(self, slot: int) -> tuple[float, uuid.UUID]:
+        return self._created_at[slot], self._ids[slot]
+
+    def search_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        count: int | None,
+        start: int = 0,
+        transport_type: TransportTypeEnum | None = None,
+        after: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[uuid.UUID]:
+        """Same semantics as `MonolitDatabaseService.get_transports_by_location`."""
+        if radius < 0:
+            return []
+
+        type_code = None if transport_type is None else TRANSPORT_TYPE_CODES[transport_type]
+        squared_radius = radius * radius
+        latitudes, longitudes = self._latitudes, self._longitudes
+        after_key = None if after is None else (after[0].timestamp(), after[1])
+
+        matches = []
+        for slot in self._iter_box_slots(
+            latitude - radius, latitude + radius, longitude - radius, longitude + radius
+        ):
+            if type_code is not None and self._types[slot] != type_code:
+                continue
+            delta_latitude = latitudes[slot] - latitude
+            delta_longitude = longitudes[slot] - longitude
+            squared_distance = delta_latitude * delta_latitude + delta_longitude * delta_longitude
+            if squared_distance > squared_radius:
+                continue
+            if after_key is not None and self._get_order_key(slot) <= after_key:
+                continue
+            matches.append(slot)
+
+        matches.sort(key=self._get_order_key)
+        end = None if count is None else start + count
+
+        return [self._ids[slot] for slot in matches[start:end]]
+
+    def _iter_ring_cells(self, cell_x: int, cell_y: int, ring: int) -> Iterator[tuple[int, int]]:
+        if ring == 0:
+            yield cell_x, cell_y
+            return
+
+        for x in range(cell_x - ring, cell_x + ring + 1):
+            yield x, cell_y - ring
+            yield x, cell_y + ring
+        for y in range(cell_y - ring + 1, cell_y + ring):
+            yield cell_x - ring, y
+            yield cell_x + ring, y
+
+    def _iter_rings(self, cell_x: int, cell_y: int) -> Iterator[tuple[int, list[set[int]]]]:
+        """Yield occupied cells grouped by their Chebyshev distance (in cells) from
+        (`cell_x`, `cell_y`), nearest first.
+        """
+        remaining = len(self._cells)
+        ring = 0
+        while remaining:
+            if 8 * ring > remaining:
+                # Sparse outskirts: cheaper to bucket the rest of occupied cells than to walk rings
+                buckets: dict[int, list[set[int]]] = {}
+                for (x, y), cell_slots in self._cells.items():
+                    cell_ring = max(abs(x - cell_x), abs(y - cell_y))
+                    if cell_ring >= ring:
+                        buckets.setdefault(cell_ring, []).append(cell_slots)
+                for cell_ring in sorted(buckets):
+                    yield cell_ring, buckets[cell_ring]
+                return
+
+            cells = [
+                self._cells[cell]
+                for cell in self._iter_ring_cells(cell_x, cell_y, ring)
+                if cell in self._cells
+            ]
+            remaining -= len(cells)
+            if cells:
+                yield ring, cells
+            ring += 1
+
+    def search_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        count: int,
+        transport_type: TransportTypeEnum | None = None,
+        can_be_rented: bool | None = True,
+    ) -> list[tuple[uuid.UUID, float]]:
+        """`count` nearest transports as (id, distance in metres), nearest first.
+
+        Rings of grid cells are scanned outwards until the `count`-th best distance is
+        not greater than the lowest possible distance to the next ring.
+        """
+        type_code = None if transport_type is None else TRANSPORT_TYPE_CODES[transport_type]
+        cell_x, cell_y = self._get_cell(latitude, longitude)
+
+        best: list[tuple[float, int]] = []  # max-heap by distance
+        for ring, cells in self._iter_rings(cell_x, cell_y):
+            if len(best) == count:
+                max_abs_latitude = max(
+                    abs(latitude),
+                    abs((cell_x - ring) * self._cell_size),
+                    abs((cell_x + ring + 1) * self._cell_size),
+                )
+                ring_distance = min_distance_for_degrees(
+                    max_abs_latitude, (ring - 1) * self._cell_size
+                )
+                if -best[0][0] <= ring_distance:
+                    break
+
+            for cell_slots in cells:
+                for slot in cell_slots:
+                    if type_code is not None and self._types[slot] != type_code:
+                        continue
+                    if can_be_rented is not None and self._can_be_rented[slot] != can_be_rented:
+                        continue
+                    distance = haversine(
+                        latitude, longitude, self._latitudes[slot], self._longitudes[slot]
+                    )
+                    if len(best) < count:
+                        heapq.heappush(best, (-distance, slot))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, slot))
+
+        return [(self._ids[slot], -distance) for distance, slot in sorted(best, reverse=True)]
+
+    def transport_saved(self, transport: Transport):
+        self.upsert(
+            transport.id,
+            transport.transportType,
+            transport.latitude,
+            transport.longitude,
+            transport.canBeRented,
+            transport.created_at,
+        )
+
+    def transport_deleted(self, transportId: uuid.UUID):
+        self.remove(transportId)
+
+    def transports_moved(self, positions: Sequence[tuple[uuid.UUID, float, float]]):
+        for transport_id, latitude, longitude in positions:
+            self.move(transport_id, latitude, longitude)
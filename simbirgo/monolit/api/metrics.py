@@ -0,0 +1,21 @@
+import fastapi
+
+from simbirgo.common.api.schemas.metrics import DatabaseMetrics, MetricsResponse
+from simbirgo.common.jwt import JWTMethods
+from simbirgo.monolit.database.service import MonolitDatabaseService
+
+
+async def metrics(request: fastapi.Request) -> MetricsResponse:
+    database_service: MonolitDatabaseService = request.app.service.database
+    jwt_methods: JWTMethods = request.app.service.jwt_methods
+
+    return MetricsResponse(
+        database=DatabaseMetrics(
+            pool=database_service.get_pool_statistics(),
+            queries=database_service.get_query_statistics(),
+        ),
+        caches={
+            "access_token": jwt_methods.access_token_cache.get_statistics(),
+            "user": database_service.get_user_cache_statistics(),
+        },
+    )
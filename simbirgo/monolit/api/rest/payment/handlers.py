@@ -1,26 +1,38 @@
+import uuid
+
 import fastapi
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from simbirgo.common.api.exceptions import HTTPForbidden
+from simbirgo.common.database.dependencies.rest import get_request_session
 from simbirgo.monolit.api.rest.transport.schemas import TransportResponse
-from simbirgo.monolit.api.rest.users.dependencies import auth_user, get_path_user
+from simbirgo.monolit.api.rest.users.dependencies import auth_user
 from simbirgo.monolit.api.rest.users.schemas import UserResponse
-from simbirgo.monolit.database.models import User
+from simbirgo.monolit.database.models import BalanceEntryKindEnum, User
 from simbirgo.monolit.database.service import MonolitDatabaseService
 
 
 async def hesoyam(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     user: User = fastapi.Depends(auth_user),
-    path_user: User = fastapi.Depends(get_path_user),
+    user_id: uuid.UUID = fastapi.Path(),
 ) -> UserResponse:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    if not user.isAdmin and user.id != path_user.id:
+    if not user.isAdmin and user.id != user_id:
         raise HTTPForbidden()
 
-    async with database_service.transaction() as session:
-        db_user = await database_service.update_user(
-            session=session, user=path_user, balance=path_user.balance + 250_000
+    db_user = await database_service.get_cached_user(session=session, userId=user_id)
+    if db_user is None:
+        raise fastapi.exceptions.HTTPException(
+            status_code=fastapi.status.HTTP_404_NOT_FOUND,
+            detail="User not found.",
         )
 
-    return UserResponse.from_db_model(db_user)
+    await database_service.append_balance_entry(
+        session=session, userId=user_id, amount=250_000, kind=BalanceEntryKindEnum.PAYMENT
+    )
+
+    balance = await database_service.get_user_balance(session=session, user=db_user)
+    return UserResponse.from_db_model(db_user, balance)
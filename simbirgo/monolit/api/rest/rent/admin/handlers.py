@@ -2,10 +2,14 @@ import uuid
 from datetime import datetime
 
 import fastapi
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from simbirgo.common.api.dependencies.pagination import Pagination, pagination
 from simbirgo.common.api.exceptions import HTTPBadRequest, HTTPForbidden
+from simbirgo.common.api.schemas.paginated import PaginatedResponse
+from simbirgo.common.database.dependencies.rest import get_request_session
 from simbirgo.monolit.api.rest.rent.dependencies import get_path_rent, get_path_rent_transport
+from simbirgo.monolit.api.rest.rent.events import RentEventEnum, append_rent_event
 from simbirgo.monolit.api.rest.rent.schemas import (
     AdminRentCreateRequest,
     AdminRentUpdateRequest,
@@ -15,7 +19,14 @@ from simbirgo.monolit.api.rest.rent.utils import days_difference, minutes_differ
 from simbirgo.monolit.api.rest.transport.dependencies import get_path_transport
 from simbirgo.monolit.api.rest.transport.schemas import TransportResponse
 from simbirgo.monolit.api.rest.users.admin.dependencies import auth_admin
-from simbirgo.monolit.database.models import Rent, RentPriceEnum, Transport, TransportTypeEnum, User
+from simbirgo.monolit.database.models import (
+    BalanceEntryKindEnum,
+    Rent,
+    RentPriceEnum,
+    Transport,
+    TransportTypeEnum,
+    User,
+)
 from simbirgo.monolit.database.service import MonolitDatabaseService
 
 
@@ -28,64 +39,99 @@ async def get_rent(
 
 async def get_user_rents(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     user_id: uuid.UUID = fastapi.Path(),
     _: User = fastapi.Depends(auth_admin),
     pagination: Pagination = fastapi.Depends(pagination),
-) -> list[RentResponse]:
+) -> PaginatedResponse[RentResponse]:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_transports = await database_service.get_rents(
+    db_transports = await database_service.get_rents(
+        session=session,
+        start=pagination.start,
+        count=pagination.count + 1,
+        after=pagination.after,
+        userId=user_id,
+    )
+
+    total_items = None
+    if pagination.total is not None:
+        total_items = await database_service.count_rents(
             session=session,
-            start=pagination.start,
-            count=pagination.count,
+            mode=pagination.total,
             userId=user_id,
         )
 
-    return [RentResponse.from_db_model(i) for i in db_transports]
+    return PaginatedResponse.from_db_models(
+        db_transports,
+        pagination,
+        RentResponse.from_db_model,
+        total_items=total_items,
+    )
 
 
 async def get_transport_rents(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     _: User = fastapi.Depends(auth_admin),
     transport: Transport = fastapi.Depends(get_path_transport),
     pagination: Pagination = fastapi.Depends(pagination),
-) -> list[RentResponse]:
+) -> PaginatedResponse[RentResponse]:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_transports = await database_service.get_rents(
+    db_transports = await database_service.get_rents(
+        session=session,
+        start=pagination.start,
+        count=pagination.count + 1,
+        after=pagination.after,
+        transportId=transport.id,
+    )
+
+    total_items = None
+    if pagination.total is not None:
+        total_items = await database_service.count_rents(
             session=session,
-            start=pagination.start,
-            count=pagination.count,
+            mode=pagination.total,
             transportId=transport.id,
         )
 
-    return [RentResponse.from_db_model(i) for i in db_transports]
+    return PaginatedResponse.from_db_models(
+        db_transports,
+        pagination,
+        RentResponse.from_db_model,
+        total_items=total_items,
+    )
 
 
 async def create_rent(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     transport: Transport = fastapi.Depends(get_path_transport),
     _: User = fastapi.Depends(auth_admin),
     data: AdminRentCreateRequest = fastapi.Body(embed=False),
 ) -> RentResponse:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_rent = await database_service.create_rent(session=session, **data.model_dump())
+    db_rent = await database_service.create_rent(session=session, **data.model_dump())
 
-        await database_service.update_transport(
-            session=session,
-            transport=transport,
-            canBeRented=False,
-        )
+    await database_service.update_transport(
+        session=session,
+        transport=transport,
+        canBeRented=False,
+    )
+    await append_rent_event(
+        database_service=database_service,
+        session=session,
+        event=RentEventEnum.STARTED,
+        rent=db_rent,
+    )
 
     return RentResponse.from_db_model(db_rent)
 
 
 async def end_rent(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     _: User = fastapi.Depends(auth_admin),
     path_rent: Rent = fastapi.Depends(get_path_rent),
     path_rent_transport: Transport = fastapi.Depends(get_path_rent_transport),
@@ -105,54 +151,61 @@ async def end_rent(
     else:
         raise HTTPBadRequest()
 
-    async with database_service.transaction() as session:
-        user = await database_service.get_user(
-            session=session,
-            userId=path_rent.userId,
-        )
-
-        if user is None:
-            raise
+    db_rent = await database_service.end_rent(
+        session=session,
+        rent=path_rent,
+        time_end=time_end,
+        final_price=final_price,
+    )
+    if db_rent is None:
+        raise HTTPBadRequest("Rent is already ended")
+
+    await database_service.update_transport(
+        session=session,
+        transport=path_rent_transport,
+        latitude=lat,
+        longitude=long,
+        canBeRented=True,
+    )
+
+    await database_service.append_balance_entry(
+        session=session,
+        userId=path_rent.userId,
+        amount=-final_price,
+        kind=BalanceEntryKindEnum.RENT,
+        rentId=path_rent.id,
+    )
+    await append_rent_event(
+        database_service=database_service,
+        session=session,
+        event=RentEventEnum.ENDED,
+        rent=db_rent,
+    )
 
-        db_rent = await database_service.update_rent(
-            session=session,
-            rent=path_rent,
-            timeEnd=time_end,
-            final_price=final_price,
-        )
-
-        await database_service.update_transport(
-            session=session,
-            transport=path_rent_transport,
-            latitude=lat,
-            longitude=long,
-            canBeRented=True,
-        )
-
-        await database_service.update_user(
-            session=session, user=user, balance=user.balance - final_price
-        )
     return RentResponse.from_db_model(db_rent)
 
 
 async def update_rent(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     path_rent: Rent = fastapi.Depends(get_path_rent),
     _: User = fastapi.Depends(auth_admin),
     data: AdminRentUpdateRequest = fastapi.Body(embed=False),
 ) -> RentResponse:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_rent = await database_service.update_rent(
-            session=session, rent=path_rent, **data.model_dump()
-        )
+    db_rent = await database_service.update_rent(
+        session=session, rent=path_rent, **data.model_dump()
+    )
 
     return RentResponse.from_db_model(db_rent)
 
 
-async def delete_rent(request: fastapi.Request, rent_id: uuid.UUID = fastapi.Path()):
+async def delete_rent(
+    request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
+    rent_id: uuid.UUID = fastapi.Path(),
+):
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        await database_service.delete_rent(session=session, rentId=rent_id)
+    await database_service.delete_rent(session=session, rentId=rent_id)
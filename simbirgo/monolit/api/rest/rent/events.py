@@ -0,0 +1,34 @@
+import enum
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from simbirgo.monolit.database.models import Rent
+from simbirgo.monolit.database.service import MonolitDatabaseService
+
+from .schemas import RentResponse
+
+RENT_EVENTS_TOPIC = "rents"
+
+
+class RentEventEnum(str, enum.Enum):
+    STARTED = "RentStarted"
+    ENDED = "RentEnded"
+
+
+async def append_rent_event(
+    database_service: MonolitDatabaseService,
+    session: AsyncSession,
+    event: RentEventEnum,
+    rent: Rent,
+):
+    # Keyed by rent: its end is appended after its start is committed and the outbox is
+    # published in order by one worker at a time, so both keep their order in a partition
+    await database_service.append_outbox_entry(
+        session=session,
+        topic=RENT_EVENTS_TOPIC,
+        key=str(rent.id),
+        payload={
+            "event": event.value,
+            "rent": RentResponse.from_db_model(rent).model_dump(mode="json"),
+        },
+    )
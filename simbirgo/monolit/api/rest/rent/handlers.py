@@ -1,42 +1,114 @@
+import uuid
 from datetime import datetime
 
 import fastapi
+from pydantic import conint
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from simbirgo.common.api.dependencies.pagination import Pagination, pagination
 from simbirgo.common.api.exceptions import HTTPBadRequest, HTTPForbidden
+from simbirgo.common.api.schemas.paginated import PaginatedResponse
+from simbirgo.common.database.dependencies.rest import get_request_session
+from simbirgo.monolit.api.fleet_index import FleetIndex
 from simbirgo.monolit.api.rest.rent.dependencies import get_path_rent, get_path_rent_transport
 from simbirgo.monolit.api.rest.rent.utils import days_difference, minutes_difference
 from simbirgo.monolit.api.rest.transport.dependencies import get_path_transport
 from simbirgo.monolit.api.rest.transport.schemas import TransportResponse
 from simbirgo.monolit.api.rest.users.dependencies import auth_user
-from simbirgo.monolit.database.models import Rent, RentPriceEnum, Transport, TransportTypeEnum, User
+from simbirgo.monolit.database.models import (
+    BalanceEntryKindEnum,
+    Rent,
+    RentPriceEnum,
+    Transport,
+    TransportTypeEnum,
+    User,
+)
 from simbirgo.monolit.database.service import MonolitDatabaseService
 
+from .events import RentEventEnum, append_rent_event
 from .schemas import RentResponse
 
 
 async def get_transports_by_location(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     lat: float = fastapi.Query(),
     long: float = fastapi.Query(),
     radius: float = fastapi.Query(),
     pagination: Pagination = fastapi.Depends(pagination),
     transportType: TransportTypeEnum = fastapi.Query(),
-) -> list[TransportResponse]:
+) -> PaginatedResponse[TransportResponse]:
     database_service: MonolitDatabaseService = request.app.service.database
+    fleet_index: FleetIndex = request.app.service.fleet_index
 
-    async with database_service.transaction() as session:
+    if fleet_index.loaded:
+        transport_ids = fleet_index.search_radius(
+            start=pagination.start,
+            count=pagination.count + 1,
+            latitude=lat,
+            longitude=long,
+            radius=radius,
+            transport_type=transportType,
+            after=pagination.after,
+        )
+        db_transports = []
+        if transport_ids:
+            db_transports = await database_service.get_transports_by_ids(
+                session=session, transportIds=transport_ids
+            )
+    else:
         db_transports = await database_service.get_transports_by_location(
             session=session,
             start=pagination.start,
-            count=pagination.count,
+            count=pagination.count + 1,
             latitude=lat,
             longitude=long,
             radius=radius,
             transportType=transportType,
+            after=pagination.after,
+        )
+
+    return PaginatedResponse.from_db_models(
+        db_transports, pagination, TransportResponse.from_db_model
+    )
+
+
+async def get_nearest_transports(
+    request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
+    lat: float = fastapi.Query(),
+    long: float = fastapi.Query(),
+    transportType: TransportTypeEnum = fastapi.Query(),
+    count: conint(ge=1, le=100) = fastapi.Query(10, description="Number of vehicles"),
+) -> list[TransportResponse]:
+    database_service: MonolitDatabaseService = request.app.service.database
+    fleet_index: FleetIndex = request.app.service.fleet_index
+
+    if fleet_index.loaded:
+        nearest = fleet_index.search_nearest(
+            latitude=lat,
+            longitude=long,
+            count=count,
+            transport_type=transportType,
+        )
+        if not nearest:
+            return []
+
+        db_transports = await database_service.get_transports_by_ids(
+            session=session, transportIds=[transport_id for transport_id, _ in nearest]
+        )
+        distances = dict(nearest)
+        db_nearest = [(i, distances[i.id]) for i in db_transports]
+    else:
+        db_nearest = await database_service.get_nearest_transports(
+            session=session,
+            latitude=lat,
+            longitude=long,
+            count=count,
+            transportType=transportType,
         )
 
-    return [TransportResponse.from_db_model(i) for i in db_transports]
+    return [TransportResponse.from_db_model(i, distance=distance) for i, distance in db_nearest]
 
 
 async def get_rent(
@@ -52,87 +124,114 @@ async def get_rent(
 
 async def get_my_rents(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     user: User = fastapi.Depends(auth_user),
     pagination: Pagination = fastapi.Depends(pagination),
-) -> list[RentResponse]:
+) -> PaginatedResponse[RentResponse]:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_transports = await database_service.get_rents(
+    db_transports = await database_service.get_rents(
+        session=session,
+        start=pagination.start,
+        count=pagination.count + 1,
+        after=pagination.after,
+        userId=user.id,
+    )
+
+    total_items = None
+    if pagination.total is not None:
+        total_items = await database_service.count_rents(
             session=session,
-            start=pagination.start,
-            count=pagination.count,
+            mode=pagination.total,
             userId=user.id,
         )
 
-    return [RentResponse.from_db_model(i) for i in db_transports]
+    return PaginatedResponse.from_db_models(
+        db_transports,
+        pagination,
+        RentResponse.from_db_model,
+        total_items=total_items,
+    )
 
 
 async def get_transport_rents(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     user: User = fastapi.Depends(auth_user),
     transport: Transport = fastapi.Depends(get_path_transport),
     pagination: Pagination = fastapi.Depends(pagination),
-) -> list[RentResponse]:
+) -> PaginatedResponse[RentResponse]:
     if user.id != transport.userId:
         raise HTTPForbidden()
 
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_transports = await database_service.get_rents(
+    db_transports = await database_service.get_rents(
+        session=session,
+        start=pagination.start,
+        count=pagination.count + 1,
+        after=pagination.after,
+        transportId=transport.id,
+    )
+
+    total_items = None
+    if pagination.total is not None:
+        total_items = await database_service.count_rents(
             session=session,
-            start=pagination.start,
-            count=pagination.count,
+            mode=pagination.total,
             transportId=transport.id,
         )
 
-    return [RentResponse.from_db_model(i) for i in db_transports]
+    return PaginatedResponse.from_db_models(
+        db_transports,
+        pagination,
+        RentResponse.from_db_model,
+        total_items=total_items,
+    )
 
 
 async def create_rent(
     request: fastapi.Request,
-    transport: Transport = fastapi.Depends(get_path_transport),
+    session: AsyncSession = fastapi.Depends(get_request_session),
+    transport_id: uuid.UUID = fastapi.Path(),
     user: User = fastapi.Depends(auth_user),
     priceType: RentPriceEnum = fastapi.Query(),
 ) -> RentResponse:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    if user.id == transport.userId:
-        raise HTTPBadRequest("Can't rent your own transport")
-
-    if transport.canBeRented is False:
+    db_rent = await database_service.start_rent(
+        session=session,
+        transportId=transport_id,
+        userId=user.id,
+        price_type=priceType,
+        time_start=datetime.now(),
+    )
+
+    if db_rent is None:
+        # Lost a race or was never allowed, only now it's worth loading the transport
+        transport = await database_service.get_transport(session=session, transportId=transport_id)
+        if transport is None:
+            raise fastapi.exceptions.HTTPException(
+                status_code=fastapi.status.HTTP_404_NOT_FOUND,
+                detail="Transport not found.",
+            )
+        if user.id == transport.userId:
+            raise HTTPBadRequest("Can't rent your own transport")
         raise HTTPBadRequest("Transportation is already on the rental")
 
-    if priceType == RentPriceEnum.MINUTES:
-        price_of_unit = transport.minutePrice
-    elif priceType == RentPriceEnum.DAYS:
-        price_of_unit = transport.dayPrice
-    else:
-        raise HTTPBadRequest()
-
-    time_start = datetime.now()
+    await append_rent_event(
+        database_service=database_service,
+        session=session,
+        event=RentEventEnum.STARTED,
+        rent=db_rent,
+    )
 
-    async with database_service.transaction() as session:
-        db_rent = await database_service.create_rent(
-            session=session,
-            userId=user.id,
-            transportId=transport.id,
-            time_start=time_start,
-            price_of_unit=price_of_unit,
-            price_type=priceType,
-        )
-
-        await database_service.update_transport(
-            session=session,
-            transport=transport,
-            canBeRented=False,
-        )
     return RentResponse.from_db_model(db_rent)
 
 
 async def end_rent(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     user: User = fastapi.Depends(auth_user),
     path_rent: Rent = fastapi.Depends(get_path_rent),
     path_rent_transport: Transport = fastapi.Depends(get_path_rent_transport),
@@ -155,23 +254,35 @@ async def end_rent(
     else:
         raise HTTPBadRequest()
 
-    async with database_service.transaction() as session:
-        db_rent = await database_service.update_rent(
-            session=session,
-            rent=path_rent,
-            timeEnd=time_end,
-            final_price=final_price,
-        )
-
-        await database_service.update_transport(
-            session=session,
-            transport=path_rent_transport,
-            latitude=lat,
-            longitude=long,
-            canBeRented=True,
-        )
+    db_rent = await database_service.end_rent(
+        session=session,
+        rent=path_rent,
+        time_end=time_end,
+        final_price=final_price,
+    )
+    if db_rent is None:
+        raise HTTPBadRequest("Rent is already ended")
+
+    await database_service.update_transport(
+        session=session,
+        transport=path_rent_transport,
+        latitude=lat,
+        longitude=long,
+        canBeRented=True,
+    )
+
+    await database_service.append_balance_entry(
+        session=session,
+        userId=user.id,
+        amount=-final_price,
+        kind=BalanceEntryKindEnum.RENT,
+        rentId=path_rent.id,
+    )
+    await append_rent_event(
+        database_service=database_service,
+        session=session,
+        event=RentEventEnum.ENDED,
+        rent=db_rent,
+    )
 
-        await database_service.update_user(
-            session=session, user=user, balance=user.balance - final_price
-        )
     return RentResponse.from_db_model(db_rent)
@@ -1,5 +1,7 @@
 import fastapi
 
+from simbirgo.common.database.dependencies.rest import read_only_request
+
 from . import handlers
 
 router = fastapi.APIRouter()
@@ -8,13 +10,31 @@ router.add_api_route(
     path="/Transport",
     methods=["GET"],
     endpoint=handlers.get_transports_by_location,
+    dependencies=[fastapi.Depends(read_only_request)],
+)
+router.add_api_route(
+    path="/Nearest",
+    methods=["GET"],
+    endpoint=handlers.get_nearest_transports,
+    dependencies=[fastapi.Depends(read_only_request)],
+)
+router.add_api_route(
+    path="/MyHistory",
+    methods=["GET"],
+    endpoint=handlers.get_my_rents,
+    dependencies=[fastapi.Depends(read_only_request)],
 )
-router.add_api_route(path="/MyHistory", methods=["GET"], endpoint=handlers.get_my_rents)
 router.add_api_route(
     path="/TransportHistory/{transport_id}",
     methods=["GET"],
     endpoint=handlers.get_transport_rents,
+    dependencies=[fastapi.Depends(read_only_request)],
 )
 router.add_api_route(path="/New/{transport_id}", methods=["POST"], endpoint=handlers.create_rent)
 router.add_api_route(path="/End/{rent_id}", methods=["POST"], endpoint=handlers.end_rent)
-router.add_api_route(path="/{rent_id}", methods=["GET"], endpoint=handlers.get_rent)
+router.add_api_route(
+    path="/{rent_id}",
+    methods=["GET"],
+    endpoint=handlers.get_rent,
+    dependencies=[fastapi.Depends(read_only_request)],
+)
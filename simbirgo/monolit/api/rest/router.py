@@ -3,6 +3,7 @@ import fastapi
 import simbirgo.monolit.api.rest.payment as payment
 import simbirgo.monolit.api.rest.rent as rent
 import simbirgo.monolit.api.rest.rent.admin as rent_admin
+import simbirgo.monolit.api.rest.telemetry as telemetry
 import simbirgo.monolit.api.rest.transport as transport
 import simbirgo.monolit.api.rest.transport.admin as transport_admin
 import simbirgo.monolit.api.rest.users as users
@@ -17,3 +18,4 @@ router.include_router(transport.router, prefix="/Transport", tags=["Transport"])
 router.include_router(rent.router, prefix="/Rent", tags=["Rent"])
 router.include_router(rent_admin.router, prefix="/Rent/Admin", tags=["Rent admin"])
 router.include_router(payment.router, prefix="/Payment", tags=["Payment"])
+router.include_router(telemetry.router, prefix="/Telemetry", tags=["Telemetry"])
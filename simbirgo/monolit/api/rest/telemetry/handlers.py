@@ -0,0 +1,76 @@
+import uuid
+
+import fastapi
+import pydantic
+
+from simbirgo.common.jwt.methods import JWTMethods
+from simbirgo.monolit.api.rest.users.dependencies import auth_admin
+from simbirgo.monolit.api.telemetry_buffer import TelemetryBuffer
+from simbirgo.monolit.database.models import User
+from simbirgo.monolit.database.service import MonolitDatabaseService
+
+from .schemas import TelemetryPoint, TelemetryPoints, TelemetryResponse
+
+
+def add_points(telemetry: TelemetryBuffer, points: list[TelemetryPoint]) -> int:
+    accepted = 0
+    for point in points:
+        accepted += telemetry.add(point.transportId, point.lat, point.long, point.ts.timestamp())
+    return accepted
+
+
+async def ingest_telemetry(
+    request: fastapi.Request,
+    _: User = fastapi.Depends(auth_admin),
+    points: list[TelemetryPoint] = fastapi.Body(),
+) -> TelemetryResponse:
+    # Positions are only buffered here, they are written in bulk by the periodic flush
+    telemetry: TelemetryBuffer = request.app.service.telemetry
+
+    return TelemetryResponse(accepted=add_points(telemetry, points))
+
+
+async def auth_websocket_admin(websocket: fastapi.WebSocket) -> uuid.UUID | None:
+    """Id of the admin the connection is authenticated as."""
+    # Browsers can't set headers of WebSocket requests, so the token may come in the query
+    access_token = websocket.query_params.get("access_token")
+    authorization = websocket.headers.get("Authorization")
+    if authorization is not None and authorization.startswith("Bearer "):
+        access_token = authorization.removeprefix("Bearer ")
+    if access_token is None:
+        return None
+
+    jwt_methods: JWTMethods = websocket.app.service.jwt_methods
+    user_id = jwt_methods.decode_access_token(access_token)
+    if user_id is None:
+        return None
+
+    database: MonolitDatabaseService = websocket.app.service.database
+    async with database.transaction(read_only=True) as session:
+        user = await database.get_cached_user(session=session, userId=user_id)
+        if user is None or not user.isAdmin:
+            return None
+
+    return user_id
+
+
+async def telemetry_websocket(websocket: fastapi.WebSocket):
+    """Every text message is a JSON list of points, answered with a `TelemetryResponse`."""
+    if await auth_websocket_admin(websocket) is None:
+        await websocket.close(code=fastapi.status.WS_1008_POLICY_VIOLATION)
+        return
+
+    telemetry: TelemetryBuffer = websocket.app.service.telemetry
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                points = TelemetryPoints.validate_json(message)
+            except pydantic.ValidationError as error:
+                await websocket.send_json({"detail": error.errors(include_url=False)})
+                continue
+            response = TelemetryResponse(accepted=add_points(telemetry, points))
+            await websocket.send_text(response.model_dump_json())
+    except fastapi.WebSocketDisconnect:
+        pass
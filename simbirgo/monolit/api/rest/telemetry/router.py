@@ -0,0 +1,8 @@
+import fastapi
+
+from . import handlers
+
+router = fastapi.APIRouter()
+
+router.add_api_route(path="/", methods=["POST"], endpoint=handlers.ingest_telemetry)
+router.add_api_websocket_route(path="/ws", endpoint=handlers.telemetry_websocket)
@@ -0,0 +1,18 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, TypeAdapter
+
+
+class TelemetryPoint(BaseModel):
+    transportId: uuid.UUID
+    lat: float
+    long: float
+    ts: datetime
+
+
+TelemetryPoints = TypeAdapter(list[TelemetryPoint])
+
+
+class TelemetryResponse(BaseModel):
+    accepted: int
@@ -1,11 +1,23 @@
 import fastapi
 
+from simbirgo.common.database.dependencies.rest import read_only_request
+
 from . import handlers
 
 router = fastapi.APIRouter()
 
-router.add_api_route(path="/", methods=["GET"], endpoint=handlers.get_transports)
-router.add_api_route(path="/{transport_id}", methods=["GET"], endpoint=handlers.get_transport)
+router.add_api_route(
+    path="/",
+    methods=["GET"],
+    endpoint=handlers.get_transports,
+    dependencies=[fastapi.Depends(read_only_request)],
+)
+router.add_api_route(
+    path="/{transport_id}",
+    methods=["GET"],
+    endpoint=handlers.get_transport,
+    dependencies=[fastapi.Depends(read_only_request)],
+)
 router.add_api_route(path="/", methods=["POST"], endpoint=handlers.create_transport)
 router.add_api_route(path="/{transport_id}", methods=["PUT"], endpoint=handlers.update_transport)
 router.add_api_route(path="/{transport_id}", methods=["DELETE"], endpoint=handlers.delete_transport)
@@ -1,7 +1,9 @@
 import uuid
 
 import fastapi
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from simbirgo.common.database.dependencies.rest import get_request_session
 from simbirgo.monolit.api.rest.users.dependencies import auth_user
 from simbirgo.monolit.database.models import Transport, User
 from simbirgo.monolit.database.service import MonolitDatabaseService
@@ -9,12 +11,12 @@ from simbirgo.monolit.database.service import MonolitDatabaseService
 
 async def get_path_transport(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     transport_id: uuid.UUID = fastapi.Path(),
 ) -> Transport:
     database: MonolitDatabaseService = request.app.service.database
 
-    async with database.transaction() as session:
-        db_transport = await database.get_transport(session=session, transportId=transport_id)
+    db_transport = await database.get_transport(session=session, transportId=transport_id)
 
     if db_transport is None:
         raise fastapi.exceptions.HTTPException(
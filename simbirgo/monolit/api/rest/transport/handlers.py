@@ -1,6 +1,9 @@
 import fastapi
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from simbirgo.common.api.dependencies.pagination import Pagination, pagination
+from simbirgo.common.api.schemas.paginated import PaginatedResponse
+from simbirgo.common.database.dependencies.rest import get_request_session
 from simbirgo.common.utils.empty import Empty
 from simbirgo.monolit.api.rest.transport.dependencies import get_path_transport
 from simbirgo.monolit.api.rest.users.dependencies import auth_user
@@ -12,22 +15,37 @@ from .schemas import TransportCreateRequest, TransportResponse
 
 async def get_my_transports(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     pagination: Pagination = fastapi.Depends(pagination),
     transportType: TransportTypeEnum = fastapi.Query(Empty),
     user: User = fastapi.Depends(auth_user),
-) -> list[TransportResponse]:
+) -> PaginatedResponse[TransportResponse]:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_transports = await database_service.get_transports(
+    db_transports = await database_service.get_transports(
+        session=session,
+        start=pagination.start,
+        count=pagination.count + 1,
+        after=pagination.after,
+        transportType=transportType,
+        userId=user.id,
+    )
+
+    total_items = None
+    if pagination.total is not None:
+        total_items = await database_service.count_transports(
             session=session,
-            start=pagination.start,
-            count=pagination.count,
+            mode=pagination.total,
             transportType=transportType,
             userId=user.id,
         )
 
-    return [TransportResponse.from_db_model(i) for i in db_transports]
+    return PaginatedResponse.from_db_models(
+        db_transports,
+        pagination,
+        TransportResponse.from_db_model,
+        total_items=total_items,
+    )
 
 
 async def get_transport(
@@ -38,39 +56,39 @@ async def get_transport(
 
 async def create_transport(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     user: User = fastapi.Depends(auth_user),
     data: TransportCreateRequest = fastapi.Body(embed=False),
 ) -> TransportResponse:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_transport = await database_service.create_transport(
-            session=session, **data.model_dump(), userId=user.id
-        )
+    db_transport = await database_service.create_transport(
+        session=session, **data.model_dump(), userId=user.id
+    )
 
     return TransportResponse.from_db_model(db_transport)
 
 
 async def update_transport(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     path_transport: Transport = fastapi.Depends(get_path_transport),
     data: TransportCreateRequest = fastapi.Body(embed=False),
 ) -> TransportResponse:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_transport = await database_service.update_transport(
-            session=session, transport=path_transport, **data.model_dump()
-        )
+    db_transport = await database_service.update_transport(
+        session=session, transport=path_transport, **data.model_dump()
+    )
 
     return TransportResponse.from_db_model(db_transport)
 
 
 async def delete_transport(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     path_transport: Transport = fastapi.Depends(get_path_transport),
 ):
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        await database_service.delete_transport(session=session, transportId=path_transport.id)
+    await database_service.delete_transport(session=session, transportId=path_transport.id)
@@ -51,9 +51,12 @@ class TransportResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     userId: uuid.UUID | None
+    distance: float | None = None
 
     @classmethod
-    def from_db_model(cls, transport: Transport) -> "TransportResponse":
+    def from_db_model(
+        cls, transport: Transport, distance: float | None = None
+    ) -> "TransportResponse":
         return cls(
             id=transport.id,
             canBeRented=transport.canBeRented,
@@ -69,4 +72,5 @@ class TransportResponse(BaseModel):
             created_at=transport.created_at,
             updated_at=transport.updated_at,
             userId=transport.userId,
+            distance=distance,
         )
@@ -1,7 +1,10 @@
 import fastapi
 import sqlalchemy.exc
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from simbirgo.common.api.dependencies.pagination import Pagination, pagination
+from simbirgo.common.api.schemas.paginated import PaginatedResponse
+from simbirgo.common.database.dependencies.rest import get_request_session
 from simbirgo.common.utils.empty import Empty
 from simbirgo.monolit.api.rest.users.dependencies import auth_admin, get_path_user
 from simbirgo.monolit.api.rest.users.schemas import UserResponse
@@ -13,55 +16,81 @@ from .schemas import AdminCreateRequest, AdminUpdateRequest
 
 async def get_users(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     pagination: Pagination = fastapi.Depends(pagination),
     _: User = fastapi.Depends(auth_admin),
-) -> list[UserResponse]:
+) -> PaginatedResponse[UserResponse]:
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        db_users = await database_service.get_users(
-            session=session, start=pagination.start, count=pagination.count
+    db_users = await database_service.get_users(
+        session=session,
+        start=pagination.start,
+        count=pagination.count + 1,
+        after=pagination.after,
+    )
+
+    total_items = None
+    if pagination.total is not None:
+        total_items = await database_service.count_users(
+            session=session,
+            mode=pagination.total,
         )
 
-    return [
-        UserResponse.from_db_model(i, with_hash_password=True, with_is_admin=True) for i in db_users
-    ]
+    balances = await database_service.get_users_balances(session=session, users=db_users)
+
+    return PaginatedResponse.from_db_models(
+        db_users,
+        pagination,
+        lambda user: UserResponse.from_db_model(
+            user, balances[user.id], with_hash_password=True, with_is_admin=True
+        ),
+        total_items=total_items,
+    )
 
 
 async def get_user_by_id(
+    request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     path_user: User = fastapi.Depends(get_path_user),
     _: User = fastapi.Depends(auth_admin),
 ) -> UserResponse:
-    return UserResponse.from_db_model(path_user, with_hash_password=True, with_is_admin=True)
+    database_service: MonolitDatabaseService = request.app.service.database
+
+    balance = await database_service.get_user_balance(session=session, user=path_user)
+    return UserResponse.from_db_model(
+        path_user, balance, with_hash_password=True, with_is_admin=True
+    )
 
 
 async def create_user(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     data: AdminCreateRequest = fastapi.Body(embed=False),
     _: User = fastapi.Depends(auth_admin),
 ) -> UserResponse:
     database_service: MonolitDatabaseService = request.app.service.database
 
     try:
-        async with database_service.transaction() as session:
-            db_user = await database_service.create_user(
-                session=session,
-                username=data.username,
-                password=data.password,
-                balance=data.balance,
-                isAdmin=data.isAdmin,
-            )
+        db_user = await database_service.create_user(
+            session=session,
+            username=data.username,
+            password=data.password,
+            balance=data.balance,
+            isAdmin=data.isAdmin,
+        )
     except sqlalchemy.exc.IntegrityError:
         raise fastapi.HTTPException(
             status_code=fastapi.status.HTTP_400_BAD_REQUEST,
             detail="Username alrady exist.",
         )
 
-    return UserResponse.from_db_model(db_user, with_hash_password=True, with_is_admin=True)
+    balance = await database_service.get_user_balance(session=session, user=db_user)
+    return UserResponse.from_db_model(db_user, balance, with_hash_password=True, with_is_admin=True)
 
 
 async def update_user_by_id(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     path_user: User = fastapi.Depends(get_path_user),
     data: AdminUpdateRequest = fastapi.Body(embed=False),
     _: User = fastapi.Depends(auth_admin),
@@ -69,30 +98,30 @@ async def update_user_by_id(
     database_service: MonolitDatabaseService = request.app.service.database
 
     try:
-        async with database_service.transaction() as session:
-            db_user = await database_service.update_user(
-                session=session,
-                user=path_user,
-                username=data.username,
-                password=data.password,
-                balance=data.balance,
-                isAdmin=data.isAdmin,
-            )
+        db_user = await database_service.update_user(
+            session=session,
+            user=path_user,
+            username=data.username,
+            password=data.password,
+            balance=data.balance,
+            isAdmin=data.isAdmin,
+        )
     except sqlalchemy.exc.IntegrityError:
         raise fastapi.HTTPException(
             status_code=fastapi.status.HTTP_400_BAD_REQUEST,
             detail="Username alrady exist.",
         )
 
-    return UserResponse.from_db_model(db_user, with_hash_password=True, with_is_admin=True)
+    balance = await database_service.get_user_balance(session=session, user=db_user)
+    return UserResponse.from_db_model(db_user, balance, with_hash_password=True, with_is_admin=True)
 
 
 async def delete_user_by_id(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     path_user: User = fastapi.Depends(get_path_user),
     _: User = fastapi.Depends(auth_admin),
 ):
     database_service: MonolitDatabaseService = request.app.service.database
 
-    async with database_service.transaction() as session:
-        await database_service.delete_user(session=session, userId=path_user.id)
+    await database_service.delete_user(session=session, userId=path_user.id)
@@ -1,8 +1,10 @@
 import uuid
 
 import fastapi
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from simbirgo.common.api.exceptions import HTTPForbidden, HTTPNotAuthenticated
+from simbirgo.common.database.dependencies.rest import get_request_session
 from simbirgo.common.jwt.dependencies.rest import auth_user_id, get_request_user_id
 from simbirgo.monolit.database.models import User
 from simbirgo.monolit.database.service import MonolitDatabaseService
@@ -10,12 +12,12 @@ from simbirgo.monolit.database.service import MonolitDatabaseService
 
 async def get_path_user(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     user_id: uuid.UUID = fastapi.Path(),
 ) -> User:
     database: MonolitDatabaseService = request.app.service.database
 
-    async with database.transaction() as session:
-        db_user = await database.get_user(session=session, userId=user_id)
+    db_user = await database.get_cached_user(session=session, userId=user_id)
     if db_user is None:
         raise fastapi.exceptions.HTTPException(
             status_code=fastapi.status.HTTP_404_NOT_FOUND,
@@ -27,24 +29,24 @@ async def get_path_user(
 
 async def get_request_user(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     request_user_id: uuid.UUID | None = fastapi.Depends(get_request_user_id),
 ) -> User | None:
     if request_user_id is None:
         return None
 
     database: MonolitDatabaseService = request.app.service.database
-    async with database.transaction() as session:
-        return await database.get_user(session=session, userId=request_user_id)
+    return await database.get_cached_user(session=session, userId=request_user_id)
 
 
 async def auth_user(
     request: fastapi.Request,
+    session: AsyncSession = fastapi.Depends(get_request_session),
     request_user_id: uuid.UUID = fastapi.Depends(auth_user_id),
 ) -> User:
     database: MonolitDatabaseService = request.app.service.database
 
-    async with database.transaction() as session:
-        user = await database.get_user(session=session, userId=request_user_id)
+    user = await database.get_cached_user(session=session, userId=request_user_id)
     if user is None:
         raise HTTPNotAuthenticated()
 
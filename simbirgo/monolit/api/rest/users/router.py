@@ -1,10 +1,17 @@
 import fastapi
 
+from simbirgo.common.database.dependencies.rest import read_only_request
+
 from . import handlers
 
 router = fastapi.APIRouter()
 
-router.add_api_route(path="/Me", methods=["GET"], endpoint=handlers.get_me)
+router.add_api_route(
+    path="/Me",
+    methods=["GET"],
+    endpoint=handlers.get_me,
+    dependencies=[fastapi.Depends(read_only_request)],
+)
 router.add_api_route(path="/SignIn", methods=["POST"], endpoint=handlers.sign_in)
 router.add_api_route(path="/SignUp", methods=["POST"], endpoint=handlers.sign_up)
 router.add_api_route(path="/SignOut", methods=["POST"], endpoint=handlers.sign_out)
@@ -36,14 +36,18 @@ class UserResponse(BaseModel):
 
     @classmethod
     def from_db_model(
-        cls, user: User, with_hash_password: bool = False, with_is_admin: bool = False
+        cls,
+        user: User,
+        balance: float,
+        with_hash_password: bool = False,
+        with_is_admin: bool = False,
     ) -> "UserResponse":
         return cls(
             id=user.id,
             username=user.username,
             password=user.password if with_hash_password else None,
             isAdmin=user.isAdmin if with_is_admin else None,
-            balance=user.balance,
+            balance=balance,
             created_at=user.created_at,
             updated_at=user.updated_at,
         )
@@ -1,16 +1,21 @@
+import asyncio
 import pathlib
 from typing import Iterable
 
 import fastapi
 from facet import ServiceMixin
+from loguru import logger
 
 from simbirgo.common.api.service import BaseAPIService
+from simbirgo.common.database.middleware import QueryStatsMiddleware, UnitOfWorkMiddleware
 from simbirgo.common.jwt import JWTMethods
 from simbirgo.common.utils.package import get_version
-from simbirgo.monolit.database.service import MonolitDatabaseService
+from simbirgo.monolit.database.service import BalanceHorizon, MonolitDatabaseService
 from simbirgo.monolit.settings import MonolitSettings
 
-from . import health, router
+from . import health, metrics, router
+from .fleet_index import FleetIndex
+from .telemetry_buffer import TelemetryBuffer
 
 
 class MonolitAPIService(BaseAPIService):
@@ -20,6 +25,11 @@ class MonolitAPIService(BaseAPIService):
         jwt_methods: JWTMethods,
         media_dir_path: pathlib.Path = pathlib.Path("/media"),
         load_file_chunk_size: int = 1024 * 1024,
+        fleet_index_cell_size: float = 0.01,
+        fleet_index_refresh_interval: float = 60,
+        balance_compaction_interval: float = 60,
+        telemetry_flush_interval: float = 1,
+        telemetry_cache_size: int = 100_000,
         version: str = "0.0.0",
         root_url: str = "http://localhost",
         root_path: str = "",
@@ -30,6 +40,15 @@ class MonolitAPIService(BaseAPIService):
         self._jwt_methods = jwt_methods
         self._media_dir_path = media_dir_path
         self._load_file_chunk_size = load_file_chunk_size
+        self._fleet_index = FleetIndex(cell_size=fleet_index_cell_size)
+        self._fleet_index_refresh_interval = fleet_index_refresh_interval
+        self._balance_compaction_interval = balance_compaction_interval
+        self._balance_horizon: BalanceHorizon | None = None
+        self._telemetry = TelemetryBuffer(timestamps_size=telemetry_cache_size)
+        self._telemetry_flush_interval = telemetry_flush_interval
+        self._telemetry_flusher: asyncio.Task | None = None
+
+        self._database.add_transport_observer(self._fleet_index)
 
         super().__init__(
             title="API",
@@ -41,13 +60,103 @@ class MonolitAPIService(BaseAPIService):
         )
 
     def setup_app(self, app: fastapi.FastAPI):
+        app.add_middleware(UnitOfWorkMiddleware, database=self._database)
+        app.add_middleware(QueryStatsMiddleware)
         app.add_api_route(path="/health", endpoint=health.health)
+        app.add_api_route(path="/metrics", endpoint=metrics.metrics)
         app.include_router(router.router, prefix="/api")
 
+    async def load_fleet_index(self):
+        self._fleet_index.begin_load()
+        # The journal replays only changes made during the load, a lagging replica
+        # snapshot would undo rent flips and moves committed before it
+        async with self._database.transaction() as session:
+            rows = await self._database.get_transports_positions(session=session)
+        self._fleet_index.finish_load(rows)
+
+    async def _refresh_fleet_index(self):
+        # Other workers write to the same database, their changes come in with reloads
+        while True:
+            await asyncio.sleep(self._fleet_index_refresh_interval)
+            try:
+                await self.load_fleet_index()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Fleet index refresh failed")
+
+    async def compact_balances(self):
+        # Entries stay in the ledger, users snapshots just skip the folded ones. The horizon
+        # taken by one run is folded by a later one, once its writers are all finished.
+        async with self._database.transaction() as session:
+            horizon = self._balance_horizon
+            if horizon is not None and await self._database.is_balance_horizon_settled(
+                session=session, horizon=horizon
+            ):
+                count = await self._database.compact_balances(
+                    session=session, upto=horizon.entryId
+                )
+                if count:
+                    logger.debug("Balance snapshots of {count} users compacted", count=count)
+                horizon = None
+            if horizon is None:
+                horizon = await self._database.get_balance_horizon(session=session)
+        self._balance_horizon = horizon
+
+    async def _compact_balances(self):
+        while True:
+            await asyncio.sleep(self._balance_compaction_interval)
+            try:
+                await self.compact_balances()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Balance compaction failed")
+
+    async def flush_telemetry(self):
+        positions = self._telemetry.drain()
+        if not positions:
+            return
+
+        try:
+            async with self._database.transaction() as session:
+                await self._database.update_transports_positions(
+                    session=session, positions=positions
+                )
+        except BaseException:
+            # Cancelled flushes too, stop() writes them once more after the cancel
+            self._telemetry.restore()
+            raise
+        self._telemetry.commit()
+
+    async def _flush_telemetry(self):
+        while True:
+            await asyncio.sleep(self._telemetry_flush_interval)
+            try:
+                await self.flush_telemetry()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Telemetry flush failed")
+
+    async def start(self):
+        await self.load_fleet_index()
+        logger.info("Fleet index loaded with {count} transports", count=len(self._fleet_index))
+        self.add_task(self._refresh_fleet_index())
+        self.add_task(self._compact_balances())
+        self._telemetry_flusher = self.add_task(self._flush_telemetry())
+
+        await super().start()
+
+    async def stop(self):
+        await super().stop()
+        # Tasks are cancelled after stop(), a periodic flush running now would lose
+        # the positions drained by the final one
+        if self._telemetry_flusher is not None:
+            self._telemetry_flusher.cancel()
+            await asyncio.wait([self._telemetry_flusher])
+        # Positions accepted since the last periodic flush, or put back by a cancelled one
+        await self.flush_telemetry()
+
     @property
     def dependencies(self) -> list[ServiceMixin]:
         return [
             self._database,
+            self._jwt_methods.blacklist,
         ]
 
     @property
@@ -58,6 +167,14 @@ class MonolitAPIService(BaseAPIService):
     def jwt_methods(self) -> JWTMethods:
         return self._jwt_methods
 
+    @property
+    def fleet_index(self) -> FleetIndex:
+        return self._fleet_index
+
+    @property
+    def telemetry(self) -> TelemetryBuffer:
+        return self._telemetry
+
     @property
     def media_dir_path(self) -> pathlib.Path:
         return self._media_dir_path
@@ -75,6 +192,11 @@ def get_service(
     return MonolitAPIService(
         database=database,
         jwt_methods=jwt_methods,
+        fleet_index_cell_size=settings.fleet_index_cell_size,
+        fleet_index_refresh_interval=settings.fleet_index_refresh_interval,
+        balance_compaction_interval=settings.balance_compaction_interval,
+        telemetry_flush_interval=settings.telemetry_flush_interval,
+        telemetry_cache_size=settings.telemetry_cache_size,
         version=get_version() or "0.0.0",
         root_url=str(settings.root_url),
         root_path=settings.root_path,
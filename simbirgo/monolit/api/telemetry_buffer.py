@@ -0,0 +1,67 @@
+import uuid
+
+from simbirgo.common.utils.cache import TTLCache
+
+
+class TelemetryBuffer:
+    """Latest reported position of every vehicle, waiting to be written in bulk.
+
+    Points are ordered by their device timestamps, a point older than the last
+    accepted one of the same vehicle is dropped, so only the newest position of a
+    vehicle is written however many points arrive between two flushes. Positions
+    are forgotten once written, only the timestamps of the `timestamps_size` most
+    recently written vehicles are kept to drop late points.
+    """
+
+    def __init__(self, timestamps_size: int = 100_000):
+        # transport id -> (timestamp, latitude, longitude) of the newest accepted point
+        self._pending: dict[uuid.UUID, tuple[float, float, float]] = {}
+        self._draining: dict[uuid.UUID, tuple[float, float, float]] = {}
+        self._written = TTLCache(maxsize=timestamps_size)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _latest_timestamp(self, transport_id: uuid.UUID) -> float | None:
+        for points in (self._pending, self._draining):
+            point = points.get(transport_id)
+            if point is not None:
+                return point[0]
+        return self._written.get(transport_id)
+
+    def add(
+        self,
+        transport_id: uuid.UUID,
+        latitude: float,
+        longitude: float,
+        timestamp: float,
+    ) -> bool:
+        latest = self._latest_timestamp(transport_id)
+        if latest is not None and latest > timestamp:
+            return False
+
+        self._pending[transport_id] = (timestamp, latitude, longitude)
+        return True
+
+    def drain(self) -> list[tuple[uuid.UUID, float, float]]:
+        """(transport id, latitude, longitude) of vehicles moved since the last drain.
+
+        The drained positions have to be either `commit`-ed or `restore`-d.
+        """
+        self._draining, self._pending = self._pending, {}
+        return [
+            (transport_id, latitude, longitude)
+            for transport_id, (_, latitude, longitude) in self._draining.items()
+        ]
+
+    def commit(self):
+        """Forget the drained positions once they are written."""
+        for transport_id, (timestamp, *_) in self._draining.items():
+            self._written.set(transport_id, timestamp)
+        self._draining = {}
+
+    def restore(self):
+        """Put drained positions back after a failed write, newer points win as usual."""
+        for transport_id, point in self._draining.items():
+            self._pending.setdefault(transport_id, point)
+        self._draining = {}
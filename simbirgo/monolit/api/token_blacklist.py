@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from facet import ServiceMixin
+from loguru import logger
+
+from simbirgo.common.jwt import BaseTokenBlacklist, MemoryTokenBlacklist, TokenBlacklistBackendEnum
+from simbirgo.common.utils.empty import Empty
+from simbirgo.monolit.database.service import MonolitDatabaseService
+from simbirgo.monolit.settings import MonolitSettings
+
+# Revocations committed by other workers may carry a slightly older `created_at`
+POLL_OVERLAP = timedelta(seconds=30)
+
+
+class DatabaseTokenBlacklist(MemoryTokenBlacklist):
+    """Revoked tokens shared through the database and mirrored into process memory.
+
+    Lookups only touch the local mirror. Revocations of other workers arrive with
+    the next poll, expired rows are deleted periodically.
+    """
+
+    def __init__(
+        self,
+        database: MonolitDatabaseService,
+        poll_interval: float = 1.0,
+        cleanup_interval: float = 600,
+    ):
+        super().__init__()
+        self._database = database
+        self._poll_interval = poll_interval
+        self._cleanup_interval = cleanup_interval
+        self._watermark: datetime | None = None
+
+    @property
+    def dependencies(self) -> list[ServiceMixin]:
+        return [
+            self._database,
+        ]
+
+    async def add(self, token_id: str, expires_at: float):
+        self.add_local(token_id, expires_at)
+        async with self._database.transaction() as session:
+            await self._database.create_revoked_token(
+                session=session,
+                tokenId=token_id,
+                expires_at=datetime.fromtimestamp(expires_at),
+            )
+
+    async def poll(self):
+        created_after = Empty if self._watermark is None else self._watermark - POLL_OVERLAP
+        async with self._database.transaction() as session:
+            rows = await self._database.get_revoked_tokens(
+                session=session, created_after=created_after
+            )
+
+        for token_id, expires_at, created_at in rows:
+            self.add_local(token_id, expires_at.timestamp())
+            if self._watermark is None or created_at > self._watermark:
+                self._watermark = created_at
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                await self.poll()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Token blacklist poll failed")
+
+    async def _cleanup(self):
+        while True:
+            await asyncio.sleep(self._cleanup_interval)
+            try:
+                async with self._database.transaction() as session:
+                    await self._database.delete_expired_revoked_tokens(session=session)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Token blacklist cleanup failed")
+
+    async def start(self):
+        await self.poll()
+        self.add_task(self._poll())
+        self.add_task(self._cleanup())
+
+
+def get_token_blacklist(
+    database: MonolitDatabaseService,
+    settings: MonolitSettings,
+) -> BaseTokenBlacklist:
+    if settings.jwt_blacklist_backend == TokenBlacklistBackendEnum.DATABASE:
+        return DatabaseTokenBlacklist(
+            database=database,
+            poll_interval=settings.jwt_blacklist_poll_interval,
+        )
+
+    return MemoryTokenBlacklist()
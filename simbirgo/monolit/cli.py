@@ -6,6 +6,7 @@ from loguru import logger
 from simbirgo.common.jwt.methods import get_jwt_methods
 
 from . import api, database
+from .outbox import get_outbox_publisher
 from .service import get_service
 from .settings import MonolitSettings, get_settings
 
@@ -15,13 +16,19 @@ def run(ctx: typer.Context):
     settings: MonolitSettings = ctx.obj["settings"]
 
     database_service = database.get_service(settings=settings)
-    jwt_methods = get_jwt_methods(settings=settings)
+    jwt_methods = get_jwt_methods(
+        settings=settings,
+        blacklist=api.get_token_blacklist(database=database_service, settings=settings),
+    )
     api_service = api.get_service(
         database=database_service,
         jwt_methods=jwt_methods,
         settings=settings,
     )
-    users_service = get_service(api=api_service)
+    users_service = get_service(
+        api=api_service,
+        outbox_publisher=get_outbox_publisher(database=database_service, settings=settings),
+    )
 
     asyncio.run(users_service.run())
 
@@ -1,8 +1,63 @@
+import asyncio
+from typing import Tuple
+
 import typer
+from loguru import logger
 
 from simbirgo.common.database.cli import get_fixtures_cli, get_migrations_cli
 
-from .service import get_service
+from .generator import DEFAULT_BOUNDING_BOX, BoundingBox, DataGenerator
+from .models import Rent, Transport, User
+from .service import MonolitDatabaseService, get_service
+
+
+async def _generate(
+    database_service: MonolitDatabaseService,
+    generator: DataGenerator,
+    users: int,
+    transports: int,
+    rents: int,
+    batch_size: int,
+):
+    await database_service.bulk_insert(
+        User.__table__, generator.generate_users(users), batch_size=batch_size
+    )
+    await database_service.bulk_insert(
+        Transport.__table__, generator.generate_transports(transports), batch_size=batch_size
+    )
+    await database_service.bulk_insert(
+        Rent.__table__, generator.generate_rents(rents), batch_size=batch_size
+    )
+
+
+@logger.catch
+def generate(
+    ctx: typer.Context,
+    users: int = typer.Option(1_000, "-u", "--users", help="Users count"),
+    transports: int = typer.Option(1_000, "-t", "--transports", help="Transports count"),
+    rents: int = typer.Option(10_000, "-r", "--rents", help="Rents count"),
+    seed: int = typer.Option(0, "-s", "--seed", help="Random seed, same seed same data"),
+    bounding_box: Tuple[float, float, float, float] = typer.Option(
+        tuple(DEFAULT_BOUNDING_BOX),
+        "--bbox",
+        help="City bounding box: min latitude, min longitude, max latitude, max longitude",
+    ),
+    days: int = typer.Option(90, "--days", help="Rents are spread over this many days"),
+    batch_size: int = typer.Option(5_000, "-b", "--batch-size", help="Rows per insert batch"),
+):
+    database_service: MonolitDatabaseService = ctx.obj["database"]
+
+    generator = DataGenerator(seed=seed, bounding_box=BoundingBox(*bounding_box), days=days)
+    asyncio.run(
+        _generate(
+            database_service,
+            generator,
+            users=users,
+            transports=transports,
+            rents=rents,
+            batch_size=batch_size,
+        )
+    )
 
 
 def service_callback(ctx: typer.Context):
@@ -16,6 +71,7 @@ def get_cli() -> typer.Typer:
     cli = typer.Typer(name="Database")
 
     cli.callback()(service_callback)
+    cli.command(name="generate")(generate)
     cli.add_typer(get_fixtures_cli(), name="fixtures")
     cli.add_typer(get_migrations_cli(), name="migrations")
 
@@ -0,0 +1,167 @@
+import math
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterator, NamedTuple
+
+from simbirgo.common.utils import md5
+from simbirgo.monolit.database.models import RentPriceEnum, TransportTypeEnum
+
+GENERATED_PASSWORD = "password"
+
+TRANSPORT_TYPES_WEIGHTS = {
+    TransportTypeEnum.SCOOTER: 60,
+    TransportTypeEnum.BIKE: 25,
+    TransportTypeEnum.CAR: 15,
+}
+# Minute and day price ranges per transport type
+TRANSPORT_PRICES = {
+    TransportTypeEnum.SCOOTER: ((5, 10), (500, 900)),
+    TransportTypeEnum.BIKE: ((3, 6), (300, 600)),
+    TransportTypeEnum.CAR: ((10, 25), (2_000, 5_000)),
+}
+TRANSPORT_MODELS = {
+    TransportTypeEnum.SCOOTER: ("Ninebot Max G30", "Xiaomi Pro 2", "Kugoo S3"),
+    TransportTypeEnum.BIKE: ("Stels Navigator", "Forward Apache", "Merida Big Nine"),
+    TransportTypeEnum.CAR: ("Kia Rio", "Hyundai Solaris", "Skoda Rapid", "Lada Vesta"),
+}
+TRANSPORT_COLORS = ("black", "white", "grey", "red", "blue", "green", "yellow")
+DAYS_RENTS_SHARE = 0.15
+
+
+class BoundingBox(NamedTuple):
+    min_latitude: float
+    min_longitude: float
+    max_latitude: float
+    max_longitude: float
+
+
+# Ulyanovsk
+DEFAULT_BOUNDING_BOX = BoundingBox(54.16, 48.25, 54.46, 48.55)
+
+
+class GeneratedTransport(NamedTuple):
+    id: uuid.UUID
+    userId: uuid.UUID
+    minutePrice: float
+    dayPrice: float
+
+
+class DataGenerator:
+    """Deterministic synthetic users, transports and rents for scale testing.
+
+    The same seed and the same calls produce the same rows, ids included. Generated users
+    share the `GENERATED_PASSWORD` password.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        bounding_box: BoundingBox = DEFAULT_BOUNDING_BOX,
+        start: datetime = datetime(2024, 1, 1),
+        days: int = 90,
+    ):
+        self._random = random.Random(seed)
+        self._bounding_box = bounding_box
+        self._start = start
+        self._period = timedelta(days=days)
+        self._password = md5.hash_string(GENERATED_PASSWORD)
+        self.user_ids: list[uuid.UUID] = []
+        self.transports: list[GeneratedTransport] = []
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self._random.getrandbits(128), version=4)
+
+    def _time_before_start(self) -> datetime:
+        return self._start - self._period * self._random.random()
+
+    def _price(self, price_range: tuple[int, int]) -> float:
+        return float(self._random.randint(*price_range))
+
+    def generate_users(self, count: int) -> Iterator[dict]:
+        for number in range(len(self.user_ids), len(self.user_ids) + count):
+            user_id = self._uuid()
+            self.user_ids.append(user_id)
+            created_at = self._time_before_start()
+            yield {
+                "id": user_id,
+                "username": f"user{number}",
+                "password": self._password,
+                "isAdmin": False,
+                "balance": float(self._random.randrange(0, 250_000, 50)),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    def generate_transports(self, count: int) -> Iterator[dict]:
+        if not self.user_ids:
+            raise ValueError("Transports need owners, generate users first")
+
+        types = list(TRANSPORT_TYPES_WEIGHTS)
+        weights = list(TRANSPORT_TYPES_WEIGHTS.values())
+        box = self._bounding_box
+        for _ in range(count):
+            transport_type = self._random.choices(types, weights)[0]
+            minute_prices, day_prices = TRANSPORT_PRICES[transport_type]
+            transport = GeneratedTransport(
+                id=self._uuid(),
+                userId=self._random.choice(self.user_ids),
+                minutePrice=self._price(minute_prices),
+                dayPrice=self._price(day_prices),
+            )
+            self.transports.append(transport)
+            created_at = self._time_before_start()
+            yield {
+                **transport._asdict(),
+                "canBeRented": True,
+                "transportType": transport_type,
+                "model": self._random.choice(TRANSPORT_MODELS[transport_type]),
+                "color": self._random.choice(TRANSPORT_COLORS),
+                "identifier": f"{self._random.randrange(1000, 10000)}-{len(self.transports)}",
+                "description": None,
+                "latitude": self._random.uniform(box.min_latitude, box.max_latitude),
+                "longitude": self._random.uniform(box.min_longitude, box.max_longitude),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    def _rent_duration(self, price_type: RentPriceEnum) -> timedelta:
+        if price_type == RentPriceEnum.DAYS:
+            return timedelta(days=self._random.randint(1, 7), hours=self._random.uniform(0, 6))
+        # Short trips dominate, log-normal with a median of 15 minutes, capped at 10 hours
+        minutes = min(self._random.lognormvariate(math.log(15), 0.7), 600)
+        return timedelta(minutes=max(minutes, 1))
+
+    def generate_rents(self, count: int) -> Iterator[dict]:
+        if not self.user_ids or not self.transports:
+            raise ValueError("Rents need users and transports, generate them first")
+
+        for _ in range(count):
+            transport = self._random.choice(self.transports)
+            user_id = self._random.choice(self.user_ids)
+            while user_id == transport.userId and len(self.user_ids) > 1:
+                user_id = self._random.choice(self.user_ids)
+            if self._random.random() < DAYS_RENTS_SHARE:
+                price_type = RentPriceEnum.DAYS
+                price_of_unit = transport.dayPrice
+            else:
+                price_type = RentPriceEnum.MINUTES
+                price_of_unit = transport.minutePrice
+            time_start = self._start + self._period * self._random.random()
+            duration = self._rent_duration(price_type)
+            if price_type == RentPriceEnum.DAYS:
+                units = duration.total_seconds() / (60 * 60 * 24)
+            else:
+                units = math.ceil(duration.total_seconds() / 60)
+            yield {
+                "id": self._uuid(),
+                "transportId": transport.id,
+                "userId": user_id,
+                "timeStart": time_start,
+                "timeEnd": time_start + duration,
+                "priceOfUnit": price_of_unit,
+                "priceType": price_type,
+                "finalPrice": units * price_of_unit,
+                "created_at": time_start,
+                "updated_at": time_start + duration,
+            }
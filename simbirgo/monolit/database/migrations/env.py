@@ -54,7 +54,12 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # Lets migrations leave the transaction, e.g. for `CREATE INDEX CONCURRENTLY`
+        transaction_per_migration=True,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
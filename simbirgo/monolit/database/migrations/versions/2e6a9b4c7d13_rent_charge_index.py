@@ -0,0 +1,37 @@
+"""rent charge index
+
+Revision ID: 2e6a9b4c7d13
+Revises: 8f1c4d7a9e25
+Create Date: 2023-11-24 11:08:42.617203
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from simbirgo.common.database.migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e6a9b4c7d13'
+down_revision: Union[str, None] = '8f1c4d7a9e25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently(
+        'ix_balance_entries_rentId_rent',
+        'balance_entries',
+        ['rentId'],
+        unique=True,
+        postgresql_where=sa.text("kind = 'RENT'"),
+        sqlite_where=sa.text("kind = 'RENT'"),
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_balance_entries_rentId_rent', 'balance_entries')
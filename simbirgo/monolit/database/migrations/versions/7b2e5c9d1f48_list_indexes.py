@@ -0,0 +1,40 @@
+"""list indexes
+
+Revision ID: 7b2e5c9d1f48
+Revises: d4a7e31f0c52
+Create Date: 2023-11-15 16:20:31.904512
+
+"""
+from typing import Sequence, Union
+
+from simbirgo.common.database.migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e5c9d1f48'
+down_revision: Union[str, None] = 'd4a7e31f0c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_users_created_at', 'users', ['created_at']),
+    ('ix_transports_created_at', 'transports', ['created_at']),
+    ('ix_transports_userId_created_at', 'transports', ['userId', 'created_at']),
+    ('ix_transports_transportType_created_at', 'transports', ['transportType', 'created_at']),
+    ('ix_transports_transportType_canBeRented', 'transports', ['transportType', 'canBeRented']),
+    ('ix_rents_userId_created_at', 'rents', ['userId', 'created_at']),
+    ('ix_rents_transportId_created_at', 'rents', ['transportId', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    for index_name, table_name, columns in INDEXES:
+        create_index_concurrently(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    for index_name, table_name, _ in reversed(INDEXES):
+        drop_index_concurrently(index_name, table_name)
@@ -1,8 +1,9 @@
 import enum
 import uuid
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import JSON, BigInteger, ForeignKey, Index, Integer, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -12,12 +13,16 @@ class Base(DeclarativeBase):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created_at", "created_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4, primary_key=True)
     username: Mapped[str] = mapped_column(unique=True)
     password: Mapped[str] = mapped_column()
     isAdmin: Mapped[bool] = mapped_column(server_default="false")
+    # Balance up to and including the `balanceWatermark` entry of the ledger,
+    # the current one adds the later `BalanceEntry` rows of the user
     balance: Mapped[float] = mapped_column(server_default="0.0")
+    balanceWatermark: Mapped[int] = mapped_column(BigInteger, server_default="0")
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.now, onupdate=datetime.now)
 
@@ -30,6 +35,13 @@ class TransportTypeEnum(str, enum.Enum):
 
 class Transport(Base):
     __tablename__ = "transports"
+    __table_args__ = (
+        Index("ix_transports_latitude_longitude", "latitude", "longitude"),
+        Index("ix_transports_created_at", "created_at"),
+        Index("ix_transports_userId_created_at", "userId", "created_at"),
+        Index("ix_transports_transportType_created_at", "transportType", "created_at"),
+        Index("ix_transports_transportType_canBeRented", "transportType", "canBeRented"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4, primary_key=True)
     canBeRented: Mapped[bool] = mapped_column(server_default="false")
@@ -47,6 +59,8 @@ class Transport(Base):
 
     userId: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
 
+    owner: Mapped[User] = relationship(lazy="raise")
+
 
 class RentPriceEnum(str, enum.Enum):
     MINUTES = "Minutes"
@@ -55,6 +69,10 @@ class RentPriceEnum(str, enum.Enum):
 
 class Rent(Base):
     __tablename__ = "rents"
+    __table_args__ = (
+        Index("ix_rents_userId_created_at", "userId", "created_at"),
+        Index("ix_rents_transportId_created_at", "transportId", "created_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4, primary_key=True)
     transportId: Mapped[uuid.UUID] = mapped_column(ForeignKey("transports.id"))
@@ -66,3 +84,66 @@ class Rent(Base):
     finalPrice: Mapped[float] = mapped_column(nullable=True)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.now, onupdate=datetime.now)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+    transport: Mapped[Transport] = relationship(lazy="raise")
+    user: Mapped[User] = relationship(lazy="raise")
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    id: Mapped[str] = mapped_column(primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now, index=True)
+
+
+class BalanceEntryKindEnum(str, enum.Enum):
+    PAYMENT = "Payment"
+    RENT = "Rent"
+    ADJUSTMENT = "Adjustment"
+
+
+class BalanceEntry(Base):
+    __tablename__ = "balance_entries"
+    __table_args__ = (
+        Index("ix_balance_entries_userId_id", "userId", "id"),
+        Index("ix_balance_entries_created_at", "created_at"),
+        # A rent is charged once, whatever races its end
+        Index(
+            "ix_balance_entries_rentId_rent",
+            "rentId",
+            unique=True,
+            postgresql_where=text("kind = 'RENT'"),
+            sqlite_where=text("kind = 'RENT'"),
+        ),
+        # Ids of deleted entries must not be reused below the users watermarks
+        {"sqlite_autoincrement": True},
+    )
+
+    # Increasing ids order the entries, SQLite only autoincrements INTEGER keys
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    userId: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    amount: Mapped[float] = mapped_column()
+    kind: Mapped[BalanceEntryKindEnum] = mapped_column()
+    rentId: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("rents.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+
+class OutboxEntry(Base):
+    """Event committed together with the change it describes, waiting to be published."""
+
+    __tablename__ = "outbox"
+    # Consumers may deduplicate by id, so ids of published entries are never reused
+    __table_args__ = ({"sqlite_autoincrement": True},)
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    topic: Mapped[str] = mapped_column()
+    key: Mapped[str | None] = mapped_column(nullable=True)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
@@ -1,26 +1,160 @@
 import pathlib
 import uuid
 from datetime import datetime
-from typing import Sequence, Type
+from functools import partial
+from typing import Any, NamedTuple, Protocol, Sequence, Type
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import (
+    BigInteger,
+    Row,
+    Text,
+    and_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    false,
+    func,
+    inspect,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import REGCLASS
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, make_transient_to_detached
 
+from simbirgo.common.database.counting import CountModeEnum
 from simbirgo.common.database.service import BaseDatabaseService
+from simbirgo.common.database.statements import (
+    StatementCache,
+    get_filters,
+    get_filters_params,
+    get_filters_shape,
+    where_equal,
+)
+from simbirgo.common.geo import haversine, min_distance_for_degrees
 from simbirgo.common.utils import md5
+from simbirgo.common.utils.cache import CacheStatistics, TTLCache
 from simbirgo.common.utils.empty import Empty
+from simbirgo.common.utils.functools import batched
 from simbirgo.monolit.database.models import (
+    BalanceEntry,
+    BalanceEntryKindEnum,
     Base,
+    OutboxEntry,
     Rent,
     RentPriceEnum,
+    RevokedToken,
     Transport,
     TransportTypeEnum,
     User,
 )
 from simbirgo.monolit.settings import MonolitSettings
 
+TRANSPORT_FILTERS = {
+    "transportId": Transport.id,
+    "canBeRented": Transport.canBeRented,
+    "transportType": Transport.transportType,
+    "model": Transport.model,
+    "color": Transport.color,
+    "identifier": Transport.identifier,
+    "description": Transport.description,
+    "latitude": Transport.latitude,
+    "longitude": Transport.longitude,
+    "minutePrice": Transport.minutePrice,
+    "dayPrice": Transport.dayPrice,
+    "userId": Transport.userId,
+}
+RENT_FILTERS = {
+    "userId": Rent.userId,
+    "rentId": Rent.id,
+    "transportId": Rent.transportId,
+    "timeStart": Rent.timeStart,
+    "timeEnd": Rent.timeEnd,
+    "priceOfUnit": Rent.priceOfUnit,
+    "priceType": Rent.priceType,
+    "final_price": Rent.finalPrice,
+}
+# Postgres advisory lock of the outbox publisher, "outbox" in ASCII
+OUTBOX_LOCK_KEY = 0x6F7574626F78
+
+
+class BalanceHorizon(NamedTuple):
+    """Ledger entries up to `entryId` are final once no transaction below `xid` runs.
+
+    `xid` is None where writers are serialized and the entries are final right away.
+    """
+
+    entryId: int
+    xid: int | None
+
+
+class TransportObserver(Protocol):
+    def transport_saved(self, transport: Transport) -> None:
+        ...
+
+    def transport_deleted(self, transportId: uuid.UUID) -> None:
+        ...
+
+    def transports_moved(self, positions: Sequence[tuple[uuid.UUID, float, float]]) -> None:
+        ...
+
+
+class OutboxObserver(Protocol):
+    def outbox_appended(self) -> None:
+        ...
+
 
 class MonolitDatabaseService(BaseDatabaseService):
+    def __init__(
+        self,
+        dsn: str,
+        user_cache_size: int = 10_000,
+        user_cache_ttl: float = 5,
+        **kwargs,
+    ):
+        super().__init__(dsn=dsn, **kwargs)
+        self._transport_observers: list[TransportObserver] = []
+        self._outbox_observers: list[OutboxObserver] = []
+        # Column values of users read by id, changes made by other workers show up after ttl
+        self._user_cache = TTLCache(maxsize=user_cache_size, ttl=user_cache_ttl)
+        self._user_columns = [attribute.key for attribute in inspect(User).column_attrs]
+        self._statements = StatementCache()
+
+    def get_user_cache_statistics(self) -> CacheStatistics:
+        return self._user_cache.get_statistics()
+
+    def add_transport_observer(self, observer: TransportObserver):
+        """Notify `observer` about committed transport changes."""
+        self._transport_observers.append(observer)
+
+    def _notify_transport_saved(self, transport: Transport):
+        for observer in self._transport_observers:
+            observer.transport_saved(transport)
+
+    def _notify_transport_deleted(self, transportId: uuid.UUID):
+        for observer in self._transport_observers:
+            observer.transport_deleted(transportId)
+
+    def _notify_transports_moved(self, positions: Sequence[tuple[uuid.UUID, float, float]]):
+        for observer in self._transport_observers:
+            observer.transports_moved(positions)
+
+    def add_outbox_observer(self, observer: OutboxObserver):
+        """Notify `observer` when outbox entries are committed."""
+        self._outbox_observers.append(observer)
+
+    def _notify_outbox_appended(self):
+        for observer in self._outbox_observers:
+            observer.outbox_appended()
+
+    def _invalidate_user(self, session: AsyncSession, userId: uuid.UUID):
+        self._user_cache.pop(userId)
+        # Concurrent reads may cache the old row again until the transaction is committed
+        self.after_commit(session, partial(self._user_cache.pop, userId))
+
     def get_alembic_config_path(self) -> pathlib.Path:
         return pathlib.Path(__file__).parent / "migrations"
 
@@ -28,7 +162,8 @@ class MonolitDatabaseService(BaseDatabaseService):
         return pathlib.Path(__file__).parent / "fixtures"
 
     def get_models(self) -> list[Type[Base]]:
-        return [User]
+        models = {mapper.local_table: mapper.class_ for mapper in Base.registry.mappers}
+        return [models[table] for table in Base.metadata.sorted_tables if table in models]
 
     async def delete_user(
         self,
@@ -37,6 +172,7 @@ class MonolitDatabaseService(BaseDatabaseService):
     ) -> None:
         stmt = delete(User).where(User.id == userId)
         await session.execute(stmt)
+        self._invalidate_user(session, userId)
 
     async def get_user(
         self,
@@ -59,13 +195,33 @@ class MonolitDatabaseService(BaseDatabaseService):
 
         return user
 
+    async def get_cached_user(self, session: AsyncSession, userId: uuid.UUID) -> User | None:
+        """`get_user` by id served from the user cache."""
+        columns = self._user_cache.get(userId)
+        if columns is None:
+            user = await self.get_user(session=session, userId=userId)
+            if user is not None:
+                self._user_cache.set(
+                    userId, {column: getattr(user, column) for column in self._user_columns}
+                )
+            return user
+
+        user = User(**columns)
+        make_transient_to_detached(user)
+
+        # Instance already in the session wins, so the request keeps one object per user
+        return await session.merge(user, load=False)
+
     async def get_users(
         self,
         session: AsyncSession,
         count: int | None,
         start: int = 0,
+        after: tuple[datetime, uuid.UUID] | None = None,
     ) -> Sequence[User]:
-        stmt = select(User).order_by(User.created_at)
+        stmt = select(User).order_by(User.created_at, User.id)
+        if after is not None:
+            stmt = stmt.where(tuple_(User.created_at, User.id) > tuple_(*after))
 
         if count is not None:
             offset = start
@@ -76,6 +232,9 @@ class MonolitDatabaseService(BaseDatabaseService):
 
         return users
 
+    async def count_users(self, session: AsyncSession, mode: CountModeEnum) -> int:
+        return await self.count_rows(session, select(User), mode=mode, key=("users",))
+
     async def update_user(
         self,
         session: AsyncSession,
@@ -89,15 +248,145 @@ class MonolitDatabaseService(BaseDatabaseService):
             user.username = username
         if password is not Empty:
             user.password = md5.hash_string(password)
-        if balance is not Empty:
-            user.balance = balance
         if isAdmin is not Empty:
             user.isAdmin = isAdmin
 
         session.add_all([user])
+        await session.flush()
+        if balance is not Empty:
+            current_balance = await self.get_user_balance(session=session, user=user)
+            await self.append_balance_entry(
+                session=session,
+                userId=user.id,
+                amount=balance - current_balance,
+                kind=BalanceEntryKindEnum.ADJUSTMENT,
+            )
+        self._invalidate_user(session, user.id)
 
         return user
 
+    async def append_balance_entry(
+        self,
+        session: AsyncSession,
+        userId: uuid.UUID,
+        amount: float,
+        kind: BalanceEntryKindEnum,
+        rentId: uuid.UUID | None = None,
+    ) -> BalanceEntry:
+        """Record a balance change in the ledger, the users row isn't touched."""
+        if session.bind.dialect.name == "postgresql":
+            # Take a transaction id before the entry id, see `get_balance_horizon`
+            await session.execute(select(cast(func.pg_current_xact_id(), Text)))
+
+        entry = BalanceEntry(userId=userId, amount=amount, kind=kind, rentId=rentId)
+        session.add_all([entry])
+        await session.flush()
+
+        return entry
+
+    async def get_user_balance(self, session: AsyncSession, user: User) -> float:
+        return (await self.get_users_balances(session=session, users=[user]))[user.id]
+
+    async def get_users_balances(
+        self,
+        session: AsyncSession,
+        users: Sequence[User],
+        batch_size: int = 1000,
+    ) -> dict[uuid.UUID, float]:
+        """Snapshot balances of `users` plus their ledger entries past the snapshot.
+
+        Snapshots and watermarks are read from the database, so users served from the
+        user cache don't have to be reloaded after a compaction. Users are queried in
+        batches of `batch_size` ids to stay below the bind parameters limits.
+        """
+        balances = {user.id: user.balance for user in users}
+
+        for userIds in batched(balances, batch_size):
+            stmt = (
+                select(User.id, User.balance + func.coalesce(func.sum(BalanceEntry.amount), 0))
+                .outerjoin(
+                    BalanceEntry,
+                    and_(
+                        BalanceEntry.userId == User.id,
+                        BalanceEntry.id > User.balanceWatermark,
+                    ),
+                )
+                .where(User.id.in_(userIds))
+                .group_by(User.id, User.balance)
+            )
+            result = await session.execute(stmt)
+            balances.update(result.tuples().all())
+
+        return balances
+
+    async def get_balance_horizon(self, session: AsyncSession) -> BalanceHorizon | None:
+        """Last allocated ledger id and the transactions that may still hold ids below it.
+
+        Postgres transactions allocate ids concurrently and commit them in any order. Ledger
+        writers take a transaction id before an entry id, and the sequence is read before the
+        snapshot, so every writer of an id up to `entryId` has a transaction id below `xid`.
+        SQLite serializes writers, so committed ids are always below uncommitted ones.
+        """
+        if session.bind.dialect.name != "postgresql":
+            entryId = (await session.execute(select(func.max(BalanceEntry.id)))).scalar()
+            return None if entryId is None else BalanceHorizon(entryId=entryId, xid=None)
+
+        sequence = func.pg_get_serial_sequence(BalanceEntry.__tablename__, BalanceEntry.id.key)
+        entryId = (
+            await session.execute(select(func.pg_sequence_last_value(cast(sequence, REGCLASS))))
+        ).scalar()
+        if entryId is None:
+            return None
+
+        snapshot_xmax = func.pg_snapshot_xmax(func.pg_current_snapshot())
+        xid = (await session.execute(select(cast(cast(snapshot_xmax, Text), BigInteger)))).scalar()
+        return BalanceHorizon(entryId=entryId, xid=xid)
+
+    async def is_balance_horizon_settled(
+        self,
+        session: AsyncSession,
+        horizon: BalanceHorizon,
+    ) -> bool:
+        """Whether every transaction that could hold ledger ids up to the horizon is over."""
+        if horizon.xid is None:
+            return True
+
+        snapshot_xmin = func.pg_snapshot_xmin(func.pg_current_snapshot())
+        xmin = (await session.execute(select(cast(cast(snapshot_xmin, Text), BigInteger)))).scalar()
+        return xmin >= horizon.xid
+
+    async def compact_balances(self, session: AsyncSession, upto: int) -> int:
+        """Fold ledger entries with ids up to `upto` into the users snapshots.
+
+        `upto` has to be the id of a settled horizon: entries show up at commit, possibly
+        out of order, and an entry committed below a watermark would never be counted.
+        Returns the number of updated users.
+        """
+        new_entries = (
+            select(BalanceEntry.amount)
+            .where(
+                BalanceEntry.userId == User.id,
+                BalanceEntry.id > User.balanceWatermark,
+                BalanceEntry.id <= upto,
+            )
+            .correlate(User)
+        )
+        stmt = (
+            update(User)
+            # Concurrent compactions may have moved the watermark further already
+            .where(User.balanceWatermark < upto, new_entries.exists())
+            .values(
+                balance=User.balance
+                + new_entries.with_only_columns(func.sum(BalanceEntry.amount)).scalar_subquery(),
+                balanceWatermark=upto,
+                updated_at=User.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+
+        return result.rowcount
+
     async def create_user(
         self,
         session: AsyncSession,
@@ -109,10 +398,19 @@ class MonolitDatabaseService(BaseDatabaseService):
         user = User(
             username=username,
             password=md5.hash_string(password),
-            balance=balance,
             isAdmin=isAdmin,
+            balance=0,
+            balanceWatermark=0,
         )
         session.add_all([user])
+        await session.flush()
+        if balance:
+            await self.append_balance_entry(
+                session=session,
+                userId=user.id,
+                amount=balance,
+                kind=BalanceEntryKindEnum.ADJUSTMENT,
+            )
 
         return user
 
@@ -120,6 +418,8 @@ class MonolitDatabaseService(BaseDatabaseService):
         stmt = delete(Transport).where(Transport.id == transportId)
         await session.execute(stmt)
 
+        self.after_commit(session, partial(self._notify_transport_deleted, transportId))
+
     async def get_transport(
         self,
         session: AsyncSession,
@@ -136,34 +436,27 @@ class MonolitDatabaseService(BaseDatabaseService):
         dayPrice: float | None | Type[Empty] = Empty,
         userId: uuid.UUID | Type[Empty] = Empty,
     ) -> Transport | None:
-        filters = []
-        if transportId is not Empty:
-            filters.append(Transport.id == transportId)
-        if canBeRented is not Empty:
-            filters.append(Transport.canBeRented == canBeRented)
-        if transportType is not Empty:
-            filters.append(Transport.transportType == transportType)
-        if model is not Empty:
-            filters.append(Transport.model == model)
-        if color is not Empty:
-            filters.append(Transport.color == color)
-        if identifier is not Empty:
-            filters.append(Transport.identifier == identifier)
-        if description is not Empty:
-            filters.append(Transport.description == description)
-        if latitude is not Empty:
-            filters.append(Transport.latitude == latitude)
-        if longitude is not Empty:
-            filters.append(Transport.longitude == longitude)
-        if minutePrice is not Empty:
-            filters.append(Transport.minutePrice == minutePrice)
-        if dayPrice is not Empty:
-            filters.append(Transport.dayPrice == dayPrice)
-        if userId is not Empty:
-            filters.append(Transport.userId == userId)
+        filters = get_filters(
+            transportId=transportId,
+            canBeRented=canBeRented,
+            transportType=transportType,
+            model=model,
+            color=color,
+            identifier=identifier,
+            description=description,
+            latitude=latitude,
+            longitude=longitude,
+            minutePrice=minutePrice,
+            dayPrice=dayPrice,
+            userId=userId,
+        )
+        shape = get_filters_shape(filters)
 
-        stmt = select(Transport).where(*filters)
-        result = await session.execute(stmt)
+        stmt = self._statements.get(
+            ("get_transport", shape),
+            lambda: where_equal(select(Transport), TRANSPORT_FILTERS, shape),
+        )
+        result = await session.execute(stmt, get_filters_params(filters))
         transport = result.unique().scalar_one_or_none()
 
         return transport
@@ -175,26 +468,45 @@ class MonolitDatabaseService(BaseDatabaseService):
         start: int = 0,
         transportType: TransportTypeEnum | Type[Empty] = Empty,
         userId: uuid.UUID | Type[Empty] = Empty,
+        after: tuple[datetime, uuid.UUID] | None = None,
     ) -> Sequence[Transport]:
-        stmt = select(Transport).order_by(Transport.created_at)
+        stmt = select(Transport).order_by(Transport.created_at, Transport.id)
+        if after is not None:
+            stmt = stmt.where(tuple_(Transport.created_at, Transport.id) > tuple_(*after))
 
         if count is not None:
             offset = start
             stmt = stmt.limit(count).offset(offset)
 
-        filters = []
+        stmt = stmt.where(*self._get_transports_filters(transportType, userId))
 
+        result = await session.execute(stmt)
+        transports = result.scalars().all()
+
+        return transports
+
+    @staticmethod
+    def _get_transports_filters(
+        transportType: TransportTypeEnum | Type[Empty] = Empty,
+        userId: uuid.UUID | Type[Empty] = Empty,
+    ) -> list:
+        filters = []
         if transportType is not Empty:
             filters.append(Transport.transportType == transportType)
         if userId is not Empty:
             filters.append(Transport.userId == userId)
+        return filters
 
-        stmt = stmt.where(*filters)
-
-        result = await session.execute(stmt)
-        transports = result.scalars().all()
-
-        return transports
+    async def count_transports(
+        self,
+        session: AsyncSession,
+        mode: CountModeEnum,
+        transportType: TransportTypeEnum | Type[Empty] = Empty,
+        userId: uuid.UUID | Type[Empty] = Empty,
+    ) -> int:
+        stmt = select(Transport).where(*self._get_transports_filters(transportType, userId))
+        key = ("transports", transportType, userId)
+        return await self.count_rows(session, stmt, mode=mode, key=key)
 
     async def get_transports_by_location(
         self,
@@ -205,8 +517,11 @@ class MonolitDatabaseService(BaseDatabaseService):
         count: int | None,
         start: int = 0,
         transportType: TransportTypeEnum | Type[Empty] = Empty,
+        after: tuple[datetime, uuid.UUID] | None = None,
     ) -> Sequence[Transport]:
-        stmt = select(Transport).order_by(Transport.created_at)
+        stmt = select(Transport).order_by(Transport.created_at, Transport.id)
+        if after is not None:
+            stmt = stmt.where(tuple_(Transport.created_at, Transport.id) > tuple_(*after))
 
         if count is not None:
             offset = start
@@ -217,12 +532,14 @@ class MonolitDatabaseService(BaseDatabaseService):
         if transportType is not Empty:
             filters.append(Transport.transportType == transportType)
 
+        # Bounding box is served by `ix_transports_latitude_longitude`,
+        # exact distance is checked only for rows inside the box.
+        filters.append(Transport.latitude.between(latitude - radius, latitude + radius))
+        filters.append(Transport.longitude.between(longitude - radius, longitude + radius))
         filters.append(
-            func.sqrt(
-                func.pow(Transport.latitude - latitude, 2)
-                + func.pow(Transport.longitude - longitude, 2)
-            )
-            <= radius
+            (Transport.latitude - latitude) * (Transport.latitude - latitude)
+            + (Transport.longitude - longitude) * (Transport.longitude - longitude)
+            <= radius * radius
         )
 
         stmt = stmt.where(*filters)
@@ -232,6 +549,78 @@ class MonolitDatabaseService(BaseDatabaseService):
 
         return transports
 
+    async def get_nearest_transports(
+        self,
+        session: AsyncSession,
+        latitude: float,
+        longitude: float,
+        count: int,
+        transportType: TransportTypeEnum | Type[Empty] = Empty,
+        canBeRented: bool | Type[Empty] = True,
+        box_size: float = 0.01,
+    ) -> list[tuple[Transport, float]]:
+        """`count` nearest transports with distances in metres, nearest first.
+
+        The bounding box around the point is doubled until the `count`-th distance is
+        guaranteed to be smaller than any distance to a point outside of the box.
+        """
+        filters = []
+        if transportType is not Empty:
+            filters.append(Transport.transportType == transportType)
+        if canBeRented is not Empty:
+            filters.append(Transport.canBeRented == canBeRented)
+
+        while True:
+            stmt = select(Transport).where(
+                Transport.latitude.between(latitude - box_size, latitude + box_size),
+                Transport.longitude.between(longitude - box_size, longitude + box_size),
+                *filters,
+            )
+            result = await session.execute(stmt)
+            transports = sorted(
+                (
+                    (i, haversine(latitude, longitude, i.latitude, i.longitude))
+                    for i in result.scalars().all()
+                ),
+                key=lambda item: item[1],
+            )
+
+            if box_size >= 180:
+                return transports[:count]
+
+            box_distance = min_distance_for_degrees(abs(latitude) + box_size, box_size)
+            if len(transports) >= count and transports[count - 1][1] <= box_distance:
+                return transports[:count]
+
+            box_size *= 2
+
+    async def get_transports_by_ids(
+        self,
+        session: AsyncSession,
+        transportIds: Sequence[uuid.UUID],
+    ) -> Sequence[Transport]:
+        if not transportIds:
+            return []
+
+        stmt = select(Transport).where(Transport.id.in_(transportIds))
+        result = await session.execute(stmt)
+        transports = {transport.id: transport for transport in result.scalars().all()}
+
+        return [transports[i] for i in transportIds if i in transports]
+
+    async def get_transports_positions(self, session: AsyncSession) -> Sequence[Row]:
+        stmt = select(
+            Transport.id,
+            Transport.transportType,
+            Transport.latitude,
+            Transport.longitude,
+            Transport.canBeRented,
+            Transport.created_at,
+        )
+        result = await session.execute(stmt)
+
+        return result.all()
+
     async def update_transport(
         self,
         session: AsyncSession,
@@ -272,9 +661,63 @@ class MonolitDatabaseService(BaseDatabaseService):
             transport.userId = userId
 
         session.add_all([transport])
+        await session.flush()
+        self.after_commit(session, partial(self._notify_transport_saved, transport))
 
         return transport
 
+    async def update_transports_positions(
+        self,
+        session: AsyncSession,
+        positions: Sequence[tuple[uuid.UUID, float, float]],
+        batch_size: int = 1000,
+    ) -> None:
+        """Write (transportId, latitude, longitude) of many transports at once.
+
+        Postgres gets one UPDATE ... FROM (VALUES ...) per batch. SQLite can't name
+        the columns of VALUES and gets an executemany UPDATE by primary key instead.
+        """
+        if not positions:
+            return
+
+        if session.bind.dialect.name != "postgresql":
+            # Core statement on the table, ORM bulk updates fail on unknown transports
+            table = Transport.__table__
+            stmt = self._statements.get(
+                "update_transports_positions",
+                lambda: update(table)
+                .where(table.c.id == bindparam("transport_id"))
+                .values(latitude=bindparam("new_latitude"), longitude=bindparam("new_longitude")),
+            )
+            await session.execute(
+                stmt,
+                [
+                    {
+                        "transport_id": transportId,
+                        "new_latitude": latitude,
+                        "new_longitude": longitude,
+                    }
+                    for transportId, latitude, longitude in positions
+                ],
+            )
+        else:
+            for batch in batched(positions, batch_size):
+                rows = values(
+                    column("id", Transport.id.type),
+                    column("latitude", Transport.latitude.type),
+                    column("longitude", Transport.longitude.type),
+                    name="positions",
+                ).data(batch)
+                stmt = (
+                    update(Transport)
+                    .where(Transport.id == rows.c.id)
+                    .values(latitude=rows.c.latitude, longitude=rows.c.longitude)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.execute(stmt)
+
+        self.after_commit(session, partial(self._notify_transports_moved, positions))
+
     async def create_transport(
         self,
         session: AsyncSession,
@@ -304,6 +747,8 @@ class MonolitDatabaseService(BaseDatabaseService):
             userId=userId,
         )
         session.add_all([transport])
+        await session.flush()
+        self.after_commit(session, partial(self._notify_transport_saved, transport))
 
         return transport
 
@@ -323,30 +768,45 @@ class MonolitDatabaseService(BaseDatabaseService):
         priceType: RentPriceEnum | Type[Empty] = Empty,
         final_price: float | Type[Empty] = Empty,
     ) -> Rent | None:
-        filters = []
-        if userId is not Empty:
-            filters.append(Rent.id == userId)
-        if rentId is not Empty:
-            filters.append(Rent.id == rentId)
-        if transportId is not Empty:
-            filters.append(Rent.transportId == transportId)
-        if timeStart is not Empty:
-            filters.append(Rent.timeStart == timeStart)
-        if timeEnd is not Empty:
-            filters.append(Rent.timeEnd == timeEnd)
-        if priceOfUnit is not Empty:
-            filters.append(Rent.priceOfUnit == priceOfUnit)
-        if priceType is not Empty:
-            filters.append(Rent.priceType == priceType)
-        if final_price is not Empty:
-            filters.append(Rent.finalPrice == final_price)
+        filters = get_filters(
+            userId=userId,
+            rentId=rentId,
+            transportId=transportId,
+            timeStart=timeStart,
+            timeEnd=timeEnd,
+            priceOfUnit=priceOfUnit,
+            priceType=priceType,
+            final_price=final_price,
+        )
+        shape = get_filters_shape(filters)
 
-        stmt = select(Rent).where(*filters)
-        result = await session.execute(stmt)
+        stmt = self._statements.get(
+            ("get_rent", shape),
+            lambda: where_equal(select(Rent), RENT_FILTERS, shape),
+        )
+        result = await session.execute(stmt, get_filters_params(filters))
         rent = result.unique().scalar_one_or_none()
 
         return rent
 
+    async def get_rent_with_relations(
+        self,
+        session: AsyncSession,
+        rentId: uuid.UUID,
+    ) -> Rent | None:
+        """Rent with its `transport` and `user` loaded in the same query."""
+        stmt = (
+            select(Rent)
+            .options(
+                joinedload(Rent.transport, innerjoin=True),
+                joinedload(Rent.user, innerjoin=True),
+            )
+            .where(Rent.id == rentId)
+        )
+        result = await session.execute(stmt)
+
+        return result.unique().scalar_one_or_none()
+
     async def get_rents(
         self,
         session: AsyncSession,
@@ -360,39 +820,81 @@ class MonolitDatabaseService(BaseDatabaseService):
         priceOfUnit: float | Type[Empty] = Empty,
         priceType: RentPriceEnum | Type[Empty] = Empty,
         final_price: float | Type[Empty] = Empty,
+        after: tuple[datetime, uuid.UUID] | None = None,
     ) -> Sequence[Rent]:
-        stmt = select(Rent).order_by(Rent.created_at)
-
+        filters = get_filters(
+            userId=userId,
+            rentId=rentId,
+            transportId=transportId,
+            timeStart=timeStart,
+            timeEnd=timeEnd,
+            priceOfUnit=priceOfUnit,
+            priceType=priceType,
+            final_price=final_price,
+        )
+        shape = get_filters_shape(filters)
+        params = get_filters_params(filters)
+        if after is not None:
+            params["after_created_at"], params["after_id"] = after
         if count is not None:
-            offset = start
-            stmt = stmt.limit(count).offset(offset)
-
-        filters = []
-        if userId is not Empty:
-            filters.append(Rent.userId == userId)
-        if rentId is not Empty:
-            filters.append(Rent.id == rentId)
-        if transportId is not Empty:
-            filters.append(Rent.transportId == transportId)
-        if timeStart is not Empty:
-            filters.append(Rent.timeStart == timeStart)
-        if timeEnd is not Empty:
-            filters.append(Rent.timeEnd == timeEnd)
-        if priceOfUnit is not Empty:
-            filters.append(Rent.priceOfUnit == priceOfUnit)
-        if priceType is not Empty:
-            filters.append(Rent.priceType == priceType)
-        if final_price is not Empty:
-            filters.append(Rent.finalPrice == final_price)
+            params["limit"], params["offset"] = count, start
 
-        stmt = stmt.where(*filters)
-        print(stmt)
+        def build_stmt():
+            stmt = where_equal(select(Rent), RENT_FILTERS, shape)
+            if after is not None:
+                stmt = stmt.where(
+                    tuple_(Rent.created_at, Rent.id)
+                    > tuple_(
+                        bindparam("after_created_at", type_=Rent.created_at.type),
+                        bindparam("after_id", type_=Rent.id.type),
+                    )
+                )
+            if count is not None:
+                stmt = stmt.limit(bindparam("limit")).offset(bindparam("offset"))
+            return stmt.order_by(Rent.created_at, Rent.id)
 
-        result = await session.execute(stmt)
+        stmt = self._statements.get(
+            ("get_rents", shape, after is not None, count is not None), build_stmt
+        )
+        result = await session.execute(stmt, params)
         rents = result.scalars().all()
 
         return rents
 
+    async def count_rents(
+        self,
+        session: AsyncSession,
+        mode: CountModeEnum,
+        userId: uuid.UUID | Type[Empty] = Empty,
+        rentId: uuid.UUID | Type[Empty] = Empty,
+        transportId: uuid.UUID | Type[Empty] = Empty,
+        timeStart: datetime | Type[Empty] = Empty,
+        timeEnd: datetime | Type[Empty] = Empty,
+        priceOfUnit: float | Type[Empty] = Empty,
+        priceType: RentPriceEnum | Type[Empty] = Empty,
+        final_price: float | Type[Empty] = Empty,
+    ) -> int:
+        filters = get_filters(
+            userId=userId,
+            rentId=rentId,
+            transportId=transportId,
+            timeStart=timeStart,
+            timeEnd=timeEnd,
+            priceOfUnit=priceOfUnit,
+            priceType=priceType,
+            final_price=final_price,
+        )
+        shape = get_filters_shape(filters)
+
+        stmt = self._statements.get(
+            ("count_rents", shape),
+            lambda: where_equal(select(Rent), RENT_FILTERS, shape),
+        )
+        key = ("rents", tuple(sorted(filters.items())))
+        return await self.count_rows(
+            session, stmt, mode=mode, key=key, params=get_filters_params(filters)
+        )
+
     async def create_rent(
         self,
         session: AsyncSession,
@@ -414,9 +916,78 @@ class MonolitDatabaseService(BaseDatabaseService):
             finalPrice=final_price,
         )
         session.add_all([rent])
+        await session.flush()
 
         return rent
 
+    async def start_rent(
+        self,
+        session: AsyncSession,
+        transportId: uuid.UUID,
+        userId: uuid.UUID,
+        price_type: RentPriceEnum,
+        time_start: datetime,
+    ) -> Rent | None:
+        """Take the transport for the user and create the rent, `None` if it isn't available.
+
+        Availability check and the `canBeRented` flip are one conditional UPDATE, so only
+        one of concurrent requests for the same transport gets it.
+        """
+        stmt = (
+            update(Transport)
+            .where(
+                Transport.id == transportId,
+                Transport.canBeRented.is_(True),
+                Transport.userId != userId,
+            )
+            .values(canBeRented=False)
+            .returning(Transport)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        transport = result.scalar_one_or_none()
+        if transport is None:
+            return None
+
+        if price_type == RentPriceEnum.MINUTES:
+            price_of_unit = transport.minutePrice
+        else:
+            price_of_unit = transport.dayPrice
+        rent = await self.create_rent(
+            session=session,
+            transportId=transportId,
+            userId=userId,
+            time_start=time_start,
+            price_of_unit=price_of_unit,
+            price_type=price_type,
+        )
+        self.after_commit(session, partial(self._notify_transport_saved, transport))
+
+        return rent
+
+    async def end_rent(
+        self,
+        session: AsyncSession,
+        rent: Rent,
+        time_end: datetime,
+        final_price: float,
+    ) -> Rent | None:
+        """Close the rent, `None` if it's already ended.
+
+        The open check and the close are one conditional UPDATE, so only one of
+        concurrent requests ends the rent and gets to charge for it.
+        """
+        stmt = (
+            update(Rent)
+            .where(Rent.id == rent.id, Rent.timeEnd.is_(None))
+            .values(timeEnd=time_end, finalPrice=final_price)
+            .returning(Rent)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await session.execute(stmt)
+
+        return result.scalar_one_or_none()
+
     async def update_rent(
         self,
         session: AsyncSession,
@@ -445,9 +1016,96 @@ class MonolitDatabaseService(BaseDatabaseService):
             rent.finalPrice = final_price
 
         session.add_all([rent])
+        await session.flush()
 
         return rent
 
+    async def append_outbox_entry(
+        self,
+        session: AsyncSession,
+        topic: str,
+        payload: dict[str, Any],
+        key: str | None = None,
+    ) -> OutboxEntry:
+        """Add an event to the outbox, it's published only if the transaction commits."""
+        entry = OutboxEntry(topic=topic, key=key, payload=payload)
+        session.add_all([entry])
+        await session.flush()
+        self.after_commit(session, self._notify_outbox_appended)
+
+        return entry
+
+    async def lock_outbox(self, session: AsyncSession) -> bool:
+        """Make the transaction of `session` the only outbox publisher until it ends.
+
+        Publishers working in parallel would send later batches before earlier ones.
+        Postgres gives False when another transaction holds the lock. SQLite takes its
+        database write lock instead, waiting for the other publisher to commit.
+        """
+        if session.bind.dialect.name != "postgresql":
+            await session.execute(delete(OutboxEntry).where(false()))
+            return True
+
+        stmt = select(func.pg_try_advisory_xact_lock(OUTBOX_LOCK_KEY))
+        return (await session.execute(stmt)).scalar()
+
+    async def get_outbox_entries(self, session: AsyncSession, count: int) -> Sequence[OutboxEntry]:
+        """Oldest entries, in the order they were appended."""
+        stmt = select(OutboxEntry).order_by(OutboxEntry.id).limit(count)
+        result = await session.execute(stmt)
+
+        return result.scalars().all()
+
+    async def delete_outbox_entries(
+        self,
+        session: AsyncSession,
+        entryIds: Sequence[int],
+    ) -> None:
+        stmt = delete(OutboxEntry).where(OutboxEntry.id.in_(entryIds))
+        await session.execute(stmt)
+
+    async def create_revoked_token(
+        self,
+        session: AsyncSession,
+        tokenId: str,
+        expires_at: datetime,
+    ) -> RevokedToken:
+        return await session.merge(RevokedToken(id=tokenId, expires_at=expires_at))
+
+    async def get_revoked_tokens(
+        self,
+        session: AsyncSession,
+        created_after: datetime | Type[Empty] = Empty,
+    ) -> Sequence[Row]:
+        stmt = select(RevokedToken.id, RevokedToken.expires_at, RevokedToken.created_at).where(
+            RevokedToken.expires_at > datetime.now()
+        )
+        if created_after is not Empty:
+            stmt = stmt.where(RevokedToken.created_at > created_after)
+        result = await session.execute(stmt)
+
+        return result.all()
+
+    async def delete_expired_revoked_tokens(self, session: AsyncSession) -> None:
+        stmt = delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now())
+        await session.execute(stmt)
+
 
 def get_service(settings: MonolitSettings) -> MonolitDatabaseService:
-    return MonolitDatabaseService(dsn=str(settings.db_dsn))
+    return MonolitDatabaseService(
+        dsn=str(settings.db_dsn),
+        replica_dsns=[str(replica_dsn) for replica_dsn in settings.db_replica_dsns],
+        user_cache_size=settings.user_cache_size,
+        user_cache_ttl=settings.user_cache_ttl,
+        pool_size=settings.db_pool_size,
+        pool_max_overflow=settings.db_pool_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        pool_warmup=settings.db_pool_warmup,
+        statement_cache_size=settings.db_statement_cache_size,
+        slow_query_threshold=settings.db_slow_query_threshold,
+        explain_slow_queries=settings.db_explain_slow_queries,
+        count_cache_ttl=settings.db_count_cache_ttl,
+        count_exact_threshold=settings.db_count_exact_threshold,
+    )
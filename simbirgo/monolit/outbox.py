@@ -0,0 +1,106 @@
+import asyncio
+
+from facet import ServiceMixin
+from loguru import logger
+
+from simbirgo.common.outbox import BaseOutboxSink, OutboxEvent, get_outbox_sink
+from simbirgo.monolit.database.service import MonolitDatabaseService
+from simbirgo.monolit.settings import MonolitSettings
+
+
+class OutboxPublisher(ServiceMixin):
+    """Drains the outbox into `sink` in batches of up to `batch_size` events.
+
+    Entries are deleted in the transaction that read them, after the sink accepted
+    the batch, so a crash in between publishes the batch again: delivery is
+    at-least-once. One publisher of all workers runs at a time, so batches go out in
+    outbox order. Commits of this process wake the publisher up at once, entries
+    of other workers are picked up every `poll_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        database: MonolitDatabaseService,
+        sink: BaseOutboxSink,
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+        max_backoff: float = 60,
+    ):
+        self._database = database
+        self._sink = sink
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._max_backoff = max_backoff
+        self._appended = asyncio.Event()
+
+        self._database.add_outbox_observer(self)
+
+    @property
+    def dependencies(self) -> list[ServiceMixin]:
+        return [
+            self._database,
+            self._sink,
+        ]
+
+    def outbox_appended(self):
+        self._appended.set()
+
+    async def publish_batch(self) -> int:
+        async with self._database.transaction() as session:
+            if not await self._database.lock_outbox(session=session):
+                return 0
+
+            entries = await self._database.get_outbox_entries(
+                session=session, count=self._batch_size
+            )
+            if not entries:
+                return 0
+
+            await self._sink.publish(
+                [OutboxEvent.model_validate(entry, from_attributes=True) for entry in entries]
+            )
+            await self._database.delete_outbox_entries(
+                session=session, entryIds=[entry.id for entry in entries]
+            )
+
+        return len(entries)
+
+    async def _publish(self):
+        backoff = 0.0
+        while True:
+            self._appended.clear()
+            try:
+                count = await self.publish_batch()
+            except Exception:  # pylint: disable=broad-exception-caught
+                backoff = min(max(backoff * 2, self._poll_interval), self._max_backoff)
+                logger.exception("Outbox publish failed, retrying in {backoff}s", backoff=backoff)
+                await asyncio.sleep(backoff)
+                continue
+            backoff = 0.0
+
+            if count == self._batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._appended.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self):
+        self.add_task(self._publish())
+
+
+def get_outbox_publisher(
+    database: MonolitDatabaseService,
+    settings: MonolitSettings,
+) -> OutboxPublisher | None:
+    sink = get_outbox_sink(settings=settings)
+    if sink is None:
+        return None
+
+    return OutboxPublisher(
+        database=database,
+        sink=sink,
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_interval,
+        max_backoff=settings.outbox_max_backoff,
+    )
@@ -1,22 +1,34 @@
 from facet import ServiceMixin
 
 from .api.service import MonolitAPIService
+from .outbox import OutboxPublisher
 
 
 class UsersService(ServiceMixin):
-    def __init__(self, api: MonolitAPIService):
+    def __init__(self, api: MonolitAPIService, outbox_publisher: OutboxPublisher | None = None):
         self._api = api
+        self._outbox_publisher = outbox_publisher
 
     @property
     def dependencies(self) -> list[ServiceMixin]:
-        return [
+        dependencies: list[ServiceMixin] = [
             self._api,
         ]
+        if self._outbox_publisher is not None:
+            dependencies.append(self._outbox_publisher)
+        return dependencies
 
     @property
     def api(self) -> MonolitAPIService:
         return self._api
 
+    @property
+    def outbox_publisher(self) -> OutboxPublisher | None:
+        return self._outbox_publisher
+
 
-def get_service(api: MonolitAPIService) -> UsersService:
-    return UsersService(api=api)
+def get_service(
+    api: MonolitAPIService,
+    outbox_publisher: OutboxPublisher | None = None,
+) -> UsersService:
+    return UsersService(api=api, outbox_publisher=outbox_publisher)
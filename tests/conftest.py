@@ -0,0 +1,15 @@
+import pathlib
+
+import pytest_asyncio
+
+from simbirgo.monolit.database.models import Base
+from simbirgo.monolit.database.service import MonolitDatabaseService
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path: pathlib.Path):
+    database = MonolitDatabaseService(dsn=f"sqlite+aiosqlite:///{tmp_path}/simbirgo.db")
+    async with database._engine.begin() as connection:  # pylint: disable=protected-access
+        await connection.run_sync(Base.metadata.create_all)
+    yield database
+    await database.stop()
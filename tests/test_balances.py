@@ -0,0 +1,77 @@
+import uuid
+from datetime import datetime
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from simbirgo.common.jwt.methods import get_jwt_methods
+from simbirgo.monolit.api.service import MonolitAPIService
+from simbirgo.monolit.database.models import BalanceEntry, BalanceEntryKindEnum, User
+from simbirgo.monolit.database.service import MonolitDatabaseService
+from simbirgo.monolit.settings import MonolitSettings
+
+USERS_COUNT = 1200
+
+
+async def fill_users(database: MonolitDatabaseService) -> list[uuid.UUID]:
+    """Users with a balance snapshot of `i` and two ledger entries, one of them folded."""
+    user_ids = [uuid.uuid4() for _ in range(USERS_COUNT)]
+    now = datetime.now()
+    await database.bulk_insert(
+        User.__table__,
+        (
+            {
+                "id": user_id,
+                "username": f"user{i}",
+                "password": "",
+                "isAdmin": i == 0,
+                "balance": float(i),
+                "balanceWatermark": i + 1,
+                "created_at": now,
+            }
+            for i, user_id in enumerate(user_ids)
+        ),
+    )
+    await database.bulk_insert(
+        BalanceEntry.__table__,
+        (
+            {"userId": user_id, "amount": amount, "kind": BalanceEntryKindEnum.PAYMENT}
+            # Entry ids 1..USERS_COUNT are below the watermarks, the rest above
+            for amount, ids in ((1000.0, user_ids), (0.5, user_ids))
+            for user_id in ids
+        ),
+    )
+    return user_ids
+
+
+@pytest.mark.asyncio
+async def test_users_balances_of_large_page(database: MonolitDatabaseService):
+    user_ids = await fill_users(database)
+
+    async with database.transaction() as session:
+        users = (await session.execute(select(User))).scalars().all()
+        balances = await database.get_users_balances(session=session, users=users)
+
+    assert balances == {user_id: i + 0.5 for i, user_id in enumerate(user_ids)}
+
+
+@pytest.mark.asyncio
+async def test_admin_users_list_of_large_page(database: MonolitDatabaseService):
+    user_ids = await fill_users(database)
+    settings = MonolitSettings(db_dsn="sqlite+aiosqlite://")
+    jwt_methods = get_jwt_methods(settings=settings)
+    api = MonolitAPIService(database=database, jwt_methods=jwt_methods)
+    headers = {"Authorization": f"Bearer {jwt_methods.issue_access_token(user_ids[0])}"}
+
+    transport = httpx.ASGITransport(app=api.get_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/api/Account/Admin/", params={"count": USERS_COUNT - 1}, headers=headers
+        )
+
+    assert response.status_code == 200
+    users = response.json()["data"]
+    assert len(users) == USERS_COUNT - 1
+    expected = {str(user_id): i + 0.5 for i, user_id in enumerate(user_ids)}
+    assert all(user["balance"] == expected[user["id"]] for user in users)
@@ -0,0 +1,30 @@
+import httpx
+import pytest
+
+from simbirgo.common.jwt.methods import get_jwt_methods
+from simbirgo.monolit.api.service import MonolitAPIService
+from simbirgo.monolit.database.service import MonolitDatabaseService
+from simbirgo.monolit.settings import MonolitSettings
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_caches(database: MonolitDatabaseService):
+    async with database.transaction() as session:
+        user = await database.create_user(session=session, username="user", password="")
+
+    settings = MonolitSettings(db_dsn="sqlite+aiosqlite://")
+    jwt_methods = get_jwt_methods(settings=settings)
+    api = MonolitAPIService(database=database, jwt_methods=jwt_methods)
+    headers = {"Authorization": f"Bearer {jwt_methods.issue_access_token(user.id)}"}
+
+    asgi = httpx.ASGITransport(app=api.get_app())
+    async with httpx.AsyncClient(transport=asgi, base_url="http://test") as client:
+        for _ in range(3):
+            response = await client.get("/api/Account/Me", headers=headers)
+            assert response.status_code == 200
+        caches = (await client.get("/metrics")).json()["caches"]
+
+    access_token = caches["access_token"]
+    assert (access_token["misses"], access_token["hits"], access_token["size"]) == (1, 2, 1)
+    user_cache = caches["user"]
+    assert (user_cache["misses"], user_cache["hits"], user_cache["size"]) == (1, 2, 1)
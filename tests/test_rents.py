@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from simbirgo.common.jwt.methods import get_jwt_methods
+from simbirgo.monolit.api.service import MonolitAPIService
+from simbirgo.monolit.database.models import (
+    BalanceEntry,
+    RentPriceEnum,
+    Transport,
+    TransportTypeEnum,
+)
+from simbirgo.monolit.database.service import MonolitDatabaseService
+from simbirgo.monolit.settings import MonolitSettings
+
+
+@pytest.mark.asyncio
+async def test_rent_is_charged_once_by_concurrent_ends(database: MonolitDatabaseService):
+    async with database.transaction() as session:
+        owner = await database.create_user(session=session, username="owner", password="")
+        renter = await database.create_user(
+            session=session, username="renter", password="", isAdmin=False
+        )
+        transport = Transport(
+            canBeRented=True,
+            transportType=TransportTypeEnum.CAR,
+            model="",
+            color="",
+            identifier="",
+            latitude=54.3,
+            longitude=48.4,
+            minutePrice=1.0,
+            userId=owner.id,
+        )
+        session.add_all([transport])
+        await session.flush()
+        rent = await database.start_rent(
+            session=session,
+            transportId=transport.id,
+            userId=renter.id,
+            price_type=RentPriceEnum.MINUTES,
+            time_start=datetime.now() - timedelta(minutes=9, seconds=30),
+        )
+
+    settings = MonolitSettings(db_dsn="sqlite+aiosqlite://")
+    jwt_methods = get_jwt_methods(settings=settings)
+    api = MonolitAPIService(database=database, jwt_methods=jwt_methods)
+    headers = {"Authorization": f"Bearer {jwt_methods.issue_access_token(renter.id)}"}
+
+    asgi = httpx.ASGITransport(app=api.get_app())
+    async with httpx.AsyncClient(transport=asgi, base_url="http://test") as client:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    f"/api/Rent/End/{rent.id}",
+                    params={"lat": 54.3, "long": 48.4},
+                    headers=headers,
+                )
+                for _ in range(2)
+            )
+        )
+        assert sorted(response.status_code for response in responses) == [200, 400]
+
+        response = await client.get("/api/Account/Me", headers=headers)
+        assert response.json()["balance"] == -10.0
+
+    async with database.transaction() as session:
+        entries = (
+            await session.execute(select(BalanceEntry).where(BalanceEntry.rentId == rent.id))
+        ).scalars().all()
+    assert [entry.amount for entry in entries] == [-10.0]